@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Any, Optional
+from typing import List, Any, Dict, Optional
 
 from app.db.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.job import Job
 from app.models.skill import Skill
-from app.schemas.job import JobCreate, Job as JobSchema, JobUpdate
-from app.services.job_recommendations import get_recommended_jobs
+from app.schemas.job import JobCreate, Job as JobSchema, JobUpdate, BatchRecommendationRequest, RecommendationFilters
+from app.services.batch_recommendations import ndjson_line
+from app.services.job_recommendations import InvalidCursorError, get_recommendation_page, rank_jobs
+from app.services.job_serialization import JOB_COLUMNS, load_job_dicts, serialize_job_rows
+from app.services.recommendation_cache import recommendation_cache
+from app.services.job_similarity import get_similar_jobs_index, set_skill_signature
+from app.services.skill_index import index_job
 
 router = APIRouter()
 
@@ -22,7 +28,7 @@ def get_jobs(
     location: Optional[str] = None,
     remote: Optional[bool] = None
 ) -> Any:
-    query = db.query(Job).filter(Job.is_active == True)
+    query = db.query(*JOB_COLUMNS).filter(Job.is_active == True)
     
     if title:
         query = query.filter(Job.title.ilike(f"%{title}%"))
@@ -33,7 +39,8 @@ def get_jobs(
     if remote is not None:
         query = query.filter(Job.remote == remote)
     
-    jobs = query.offset(skip).limit(limit).all()
+    # Plain rows plus one batched skills query instead of a lazy load per job
+    jobs = serialize_job_rows(db, query.order_by(Job.id).offset(skip).limit(limit).all())
     return jobs
 
 @router.post("/", response_model=JobSchema)
@@ -61,15 +68,94 @@ def create_job(
         if skill:
             db_job.required_skills.append(skill)
     
+    set_skill_signature(db_job)
     db.add(db_job)
     db.commit()
     db.refresh(db_job)
+    index_job(db_job)
     return db_job
 
 @router.get("/recommended", response_model=List[JobSchema])
 def get_job_recommendations(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    limit: int = 10,
+    remote: Optional[bool] = None,
+    location: Optional[str] = None,
+    job_type: Optional[str] = None,
+    salary_min: Optional[float] = None,
+    salary_max: Optional[float] = None,
+    source: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> Any:
+    filters = RecommendationFilters(
+        remote=remote,
+        location=location,
+        job_type=job_type,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        source=source
+    )
+    try:
+        jobs, next_cursor = get_recommendation_page(db, current_user, limit, filters, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    # Pass this back as `cursor` to get the next page
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return jobs
+
+@router.post("/recommended/batch")
+def get_batch_job_recommendations(
+    request: BatchRecommendationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    # Only the caller's own recommendations; digests for many users are
+    # written by `python -m app.services.batch_recommendations`
+    if request.user_ids is not None and set(request.user_ids) != {current_user.id}:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to get recommendations of other users"
+        )
+    # Ranked by the configured backend, like /recommended
+    top_jobs = rank_jobs(db, current_user, request.limit)
+    return StreamingResponse(
+        iter([ndjson_line(current_user.id, top_jobs)]),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/recommended/cache-stats", response_model=Dict[str, Any])
+def get_recommendation_cache_stats(
+    current_user: User = Depends(get_current_user)
+) -> Any:
+    return recommendation_cache.stats()
+
+@router.get("/{job_id}/similar", response_model=List[JobSchema])
+def get_similar_jobs(
+    job_id: int,
+    db: Session = Depends(get_db),
     limit: int = 10
 ) -> Any:
-    return get_recommended_jobs(db, current_user, limit)
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    # Candidates come from LSH buckets; match_score is the estimated
+    # skill-set Jaccard similarity in percent
+    similar = get_similar_jobs_index(db).similar(job, limit)
+    jobs_by_id = load_job_dicts(db, [similar_id for similar_id, _ in similar])
+    results = []
+    for similar_id, similarity in similar:
+        similar_job = jobs_by_id.get(similar_id)
+        if similar_job:
+            similar_job["match_score"] = similarity * 100
+            results.append(similar_job)
+    return results
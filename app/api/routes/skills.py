@@ -2,11 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Any
 
+from app.core.config import settings
 from app.db.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.skill import Skill
 from app.schemas.skill import SkillCreate, Skill as SkillSchema
+from app.services.score_store import rebuild_user_scores
+from app.services.skill_matcher import skill_matcher_cache
 
 router = APIRouter()
 
@@ -31,6 +34,8 @@ def create_skill(
     db.add(db_skill)
     db.commit()
     db.refresh(db_skill)
+    # Job descriptions should be matched against the new skill too
+    skill_matcher_cache.invalidate()
     return db_skill
 
 @router.post("/add-to-user/{skill_id}", response_model=SkillSchema)
@@ -47,4 +52,7 @@ def add_skill_to_user(
         )
     current_user.skills.append(skill)
     db.commit()
+    # Only the precomputed backend reads user_job_scores
+    if settings.RECOMMENDATION_BACKEND == "precomputed":
+        rebuild_user_scores(db, current_user.id)
     return skill
\ No newline at end of file
@@ -18,6 +18,77 @@ class Settings(BaseSettings):
     ALGORITHM:str=os.getenv("ALGORITHM","HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES:int=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES",30))
     
+    #recommendations
+    # "index": incremental skill->job inverted index, "memory": in-process
+    # sparse skill matrix, "database": top-k query in PostgreSQL
+    # "precomputed": read the user_job_scores table rebuilt after each sync
+    RECOMMENDATION_BACKEND:str=os.getenv("RECOMMENDATION_BACKEND","index")
+    # Jobs kept per user in user_job_scores
+    RECOMMENDATION_PRECOMPUTE_TOP_N:int=int(os.getenv("RECOMMENDATION_PRECOMPUTE_TOP_N",100))
+    RECOMMENDATION_CACHE_MAX_ENTRIES:int=int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES",10000))
+    RECOMMENDATION_CACHE_MAX_BYTES:int=int(os.getenv("RECOMMENDATION_CACHE_MAX_BYTES",64 * 1024 * 1024))
+    # Pages ranked (and cached) up front when the first page is requested
+    RECOMMENDATION_PREFETCH_PAGES:int=int(os.getenv("RECOMMENDATION_PREFETCH_PAGES",5))
+    
+    #scraping
+    # Requests in flight at once, across all hosts
+    SCRAPER_MAX_CONCURRENCY:int=int(os.getenv("SCRAPER_MAX_CONCURRENCY",8))
+    # Politeness budget per host: average rate and burst size
+    SCRAPER_REQUESTS_PER_SECOND:float=float(os.getenv("SCRAPER_REQUESTS_PER_SECOND",1.0))
+    SCRAPER_BURST:int=int(os.getenv("SCRAPER_BURST",2))
+    # Retries after a 429, a 5xx or a connection error
+    SCRAPER_MAX_RETRIES:int=int(os.getenv("SCRAPER_MAX_RETRIES",3))
+    # Longest wait honored from a Retry-After header, in seconds
+    SCRAPER_MAX_RETRY_AFTER_SECONDS:float=float(os.getenv("SCRAPER_MAX_RETRY_AFTER_SECONDS",60))
+    # On-disk conditional-GET cache of fetched pages; empty disables it
+    HTTP_CACHE_PATH:str=os.getenv("HTTP_CACHE_PATH",".cache/http_cache.sqlite3")
+    HTTP_CACHE_MAX_BYTES:int=int(os.getenv("HTTP_CACHE_MAX_BYTES",256 * 1024 * 1024))
+    # "selectolax", "lxml", "bs4", or "auto" for the fastest one installed
+    HTML_PARSER:str=os.getenv("HTML_PARSER","auto")
+    # Where the sources are fetched from; point them at
+    # `python -m benchmarks.fixture_server` to crawl offline
+    INDEED_BASE_URL:str=os.getenv("INDEED_BASE_URL","https://www.indeed.com")
+    ADZUNA_BASE_URL:str=os.getenv("ADZUNA_BASE_URL","https://api.adzuna.com/v1/api/jobs")
+    # The Adzuna collector only runs when both are set
+    ADZUNA_APP_ID:Optional[str]=os.getenv("ADZUNA_APP_ID")
+    ADZUNA_API_KEY:Optional[str]=os.getenv("ADZUNA_API_KEY")
+    # Adzuna result pages fetched per keyword (at most 50 results each),
+    # and the API's own rate budget
+    ADZUNA_MAX_PAGES:int=int(os.getenv("ADZUNA_MAX_PAGES",10))
+    ADZUNA_RESULTS_PER_PAGE:int=int(os.getenv("ADZUNA_RESULTS_PER_PAGE",50))
+    ADZUNA_REQUESTS_PER_SECOND:float=float(os.getenv("ADZUNA_REQUESTS_PER_SECOND",0.4))
+    
+    #job sync
+    # Run the sync scheduler inside the API processes; turn it off when a
+    # separate `python -m app.services.sync_worker` process runs the syncs
+    SYNC_IN_PROCESS:bool=os.getenv("SYNC_IN_PROCESS","true").lower() in ("1","true","yes")
+    # Crawl interval of a search before its change rate is known
+    SYNC_INTERVAL_HOURS:float=float(os.getenv("SYNC_INTERVAL_HOURS",12))
+    # How often the scheduler looks for searches due for a crawl
+    SYNC_CHECK_MINUTES:float=float(os.getenv("SYNC_CHECK_MINUTES",15))
+    # Bounds of the adaptive per-search crawl interval, and the share of new
+    # or changed postings per crawl it steers towards
+    CRAWL_MIN_INTERVAL_HOURS:float=float(os.getenv("CRAWL_MIN_INTERVAL_HOURS",1))
+    CRAWL_MAX_INTERVAL_HOURS:float=float(os.getenv("CRAWL_MAX_INTERVAL_HOURS",72))
+    CRAWL_TARGET_CHANGE_RATE:float=float(os.getenv("CRAWL_TARGET_CHANGE_RATE",0.1))
+    # Active jobs no crawl has seen for this long are retired; keep it well
+    # above CRAWL_MAX_INTERVAL_HOURS so every search gets to see its jobs
+    JOB_RETIRE_AFTER_HOURS:float=float(os.getenv("JOB_RETIRE_AFTER_HOURS",168))
+    # Retired jobs are deleted after this many days, this many at a time
+    JOB_RETENTION_DAYS:int=int(os.getenv("JOB_RETENTION_DAYS",30))
+    JOB_PURGE_CHUNK_SIZE:int=int(os.getenv("JOB_PURGE_CHUNK_SIZE",1000))
+    # How often API processes check whether a sync finished elsewhere
+    SYNC_POLL_SECONDS:int=int(os.getenv("SYNC_POLL_SECONDS",60))
+    # Searches crawled at once, and workers of the parse and skill
+    # extraction stages (jobs are persisted by a single writer)
+    SYNC_FETCH_CONCURRENCY:int=int(os.getenv("SYNC_FETCH_CONCURRENCY",4))
+    SYNC_PARSE_WORKERS:int=int(os.getenv("SYNC_PARSE_WORKERS",2))
+    SYNC_EXTRACT_WORKERS:int=int(os.getenv("SYNC_EXTRACT_WORKERS",2))
+    # Items a stage queue holds before its producers wait, and jobs per
+    # extraction and upsert batch
+    SYNC_QUEUE_SIZE:int=int(os.getenv("SYNC_QUEUE_SIZE",400))
+    SYNC_BATCH_SIZE:int=int(os.getenv("SYNC_BATCH_SIZE",200))
+    
     
     #cors
     BACKEND_CORS_ORIGINS:list=[
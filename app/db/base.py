@@ -6,4 +6,7 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.job import Job
 from app.models.application import Application
-from app.models.skill import Skill
\ No newline at end of file
+from app.models.skill import Skill
+from app.models.user_job_score import UserJobScore
+from app.models.sync_run import SyncRun
+from app.models.crawl_schedule import CrawlSchedule
\ No newline at end of file
@@ -10,8 +10,7 @@ from app.db.database import engine
 from app.db.base_class import Base
 from app.api.routes import auth, skills, jobs, applications, users
 
-from app.db.database import SessionLocal
-from app.services.job_sync import JobSyncService
+from app.services.sync_worker import CatalogWatcher, start_sync_scheduler
 
 
 # Create all tables in the database
@@ -20,20 +19,22 @@ Base.metadata.create_all(bind=engine)
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup logic
-    logging.info("Starting job sync service...")
+    # Syncs run in one process at a time (see app.services.sync_worker);
+    # every process reloads its job indexes once a sync has finished
+    watcher = CatalogWatcher()
     try:
-        db = SessionLocal()
-        job_sync = JobSyncService(db)
-        await job_sync.schedule_sync(interval_hours=12)
+        watcher.start()
+        if settings.SYNC_IN_PROCESS:
+            logging.info("Starting job sync service...")
+            start_sync_scheduler()
     except Exception as e:
         logging.error(f"Failed to start job sync: {str(e)}")
-        db.close()
+        watcher.stop()
         raise
     yield
     # Shutdown logic
     logging.info("Shutting down job sync service...")
-    if 'db' in locals():
-        db.close()
+    watcher.stop()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -50,6 +51,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
 # Include API routes
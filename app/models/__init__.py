@@ -4,11 +4,17 @@ from .user import User
 from .job import Job
 from .skill import Skill
 from .application import Application
+from .user_job_score import UserJobScore
+from .sync_run import SyncRun
+from .crawl_schedule import CrawlSchedule
 
 # List models to be exported
 __all__ = [
     'User',
     'Job',
     'Skill',
-    'Application'
+    'Application',
+    'UserJobScore',
+    'SyncRun',
+    'CrawlSchedule'
 ]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from app.db.base_class import Base
+
+
+class CrawlSchedule(Base):
+    """When each search of the job sync is crawled next, and how often its results change"""
+    __tablename__= "crawl_schedules"
+    
+    id= Column(Integer, primary_key=True, index=True)
+    # Class name of the scraper or collector, and its search terms as sorted JSON
+    source= Column(String(100), nullable=False)
+    query= Column(String(500), nullable=False)
+    interval_seconds= Column(Float, nullable=False)
+    next_run_at= Column(DateTime, nullable=False, index=True)
+    last_run_at= Column(DateTime, nullable=True)
+    # Smoothed share of the postings found new or changed, per hour
+    change_rate= Column(Float, nullable=True)
+    runs= Column(Integer, nullable=False, default=0)
+    
+    __table_args__= (
+        UniqueConstraint("source", "query", name="uq_crawl_schedules_source_query"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean,Float , DateTime, Table, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean,Float , DateTime, Table, ForeignKey, Text, LargeBinary, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -20,7 +20,27 @@ class Job(Base):
     posted_date= Column(DateTime, default= func.now())
     is_active=Column(Boolean, default=True)
     source= Column(String)
+    # MinHash signature of the required skill ids, for "similar jobs"
+    skill_minhash= Column(LargeBinary, nullable=True)
+    # Hash of the posting's canonical URL, the upsert key for scraped and collected jobs
+    source_key= Column(String(64), nullable=True, unique=True, index=True)
+    # Hash of the normalized title, company and location, shared across sources
+    posting_key= Column(String(64), nullable=True, unique=True, index=True)
+    # MinHash signature of the description's word shingles, for near-duplicates
+    description_minhash= Column(LargeBinary, nullable=True)
+    # Fingerprint of the scraped content, to skip unchanged re-scrapes
+    content_hash= Column(String(64), nullable=True, index=True)
+    updated_at= Column(DateTime, default= func.now(), onupdate= func.now())
+    # Bumped whenever a sync sees the job, changed or not
+    last_seen_at= Column(DateTime, default= func.now())
+    # When the job was marked inactive; retention is counted from here
+    retired_at= Column(DateTime, nullable=True, index=True)
     
     #relationships
     required_skills= relationship("Skill", secondary= job_skill, back_populates="jobs")
-    applications= relationship("Application", back_populates="job")
\ No newline at end of file
+    applications= relationship("Application", back_populates="job")
+    
+    __table_args__= (
+        # Active jobs by when a sync last saw them, for retirement
+        Index("ix_jobs_active_last_seen_at", "last_seen_at", postgresql_where=text("is_active")),
+    )
\ No newline at end of file
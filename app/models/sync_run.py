@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class SyncRun(Base):
+    """One job sync, recorded so API processes know when to reload the catalog"""
+    __tablename__= "sync_runs"
+    
+    id= Column(Integer, primary_key=True, index=True)
+    started_at= Column(DateTime, default=func.now(), nullable=False)
+    finished_at= Column(DateTime, nullable=True)
+    # "running", "succeeded" or "failed"
+    status= Column(String(20), nullable=False, default="running")
+    jobs_seen= Column(Integer, nullable=True)
+    jobs_inserted= Column(Integer, nullable=True)
+    jobs_updated= Column(Integer, nullable=True)
+    jobs_retired= Column(Integer, nullable=True)
+    error= Column(Text, nullable=True)
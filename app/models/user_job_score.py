@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class UserJobScore(Base):
+    """Materialized top-N job recommendations per user"""
+    __tablename__= "user_job_scores"
+    
+    user_id= Column(Integer, ForeignKey("users.id"), primary_key=True)
+    job_id= Column(Integer, ForeignKey("jobs.id"), primary_key=True)
+    score= Column(Float, nullable=False)
+    rank= Column(Integer, nullable=False)
+    computed_at= Column(DateTime, default=func.now())
+    
+    __table_args__= (
+        Index("ix_user_job_scores_user_id_rank", "user_id", "rank"),
+    )
@@ -21,6 +21,18 @@ class JobCreate(JobBase):
 class JobUpdate(JobBase):
     required_skills_ids: Optional[List[int]] = None
 
+class RecommendationFilters(BaseModel):
+    remote: Optional[bool] = None
+    location: Optional[str] = None
+    job_type: Optional[str] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    source: Optional[str] = None
+
+class BatchRecommendationRequest(BaseModel):
+    user_ids: Optional[List[int]] = None  # Only the current user's own id; None means the current user
+    limit: int = 10
+
 class Job(JobBase):
     id: int
     posted_date: datetime
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.user import User, user_skill
+from app.services.recommendation_engine import RecommendationEngine
+
+# Below this many users the pool start-up costs more than it saves
+MIN_USERS_FOR_POOL = 200
+
+UserSkills = Tuple[int, Tuple[int, ...]]
+
+_worker_engine: Optional[RecommendationEngine] = None
+
+
+def load_batch_inputs(
+    db: Session,
+    user_ids: Optional[Sequence[int]] = None,
+    engine: Optional[RecommendationEngine] = None
+) -> Tuple[RecommendationEngine, List[UserSkills]]:
+    """
+    Read everything a batch run needs in two queries: the active job x skill
+    matrix (unless an already loaded `engine` is given) and the skill ids of
+    the requested users (all active users when `user_ids` is None). Users
+    without skills are kept so they still get a (empty) result line.
+    """
+    if engine is None:
+        engine = RecommendationEngine()
+        engine.refresh(db)
+
+    if user_ids is None:
+        user_filter = User.is_active == True
+    else:
+        user_filter = User.id.in_(user_ids)
+    users_query = select(User.id).where(user_filter).order_by(User.id)
+    skills_query = (
+        select(user_skill.c.user_id, user_skill.c.skill_id)
+        .join(User, User.id == user_skill.c.user_id)
+        .where(user_filter)
+    )
+
+    skills_by_user: Dict[int, List[int]] = defaultdict(list)
+    for user_id, skill_id in db.execute(skills_query):
+        skills_by_user[user_id].append(skill_id)
+
+    users = [
+        (user_id, tuple(skills_by_user.get(user_id, ())))
+        for user_id in db.execute(users_query).scalars()
+    ]
+    return engine, users
+
+
+def _init_worker(engine: RecommendationEngine) -> None:
+    global _worker_engine
+    _worker_engine = engine
+
+
+def ndjson_line(user_id: int, top_jobs: List[Tuple[int, float]]) -> str:
+    """One user's (job_id, match_score) pairs as an NDJSON line"""
+    return json.dumps({
+        "user_id": user_id,
+        "jobs": [{"job_id": job_id, "match_score": score} for job_id, score in top_jobs]
+    }, separators=(",", ":")) + "\n"
+
+
+def _recommend_chunk(users: List[UserSkills], limit: int, engine: Optional[RecommendationEngine] = None) -> str:
+    """Score a chunk of users and render their NDJSON lines"""
+    engine = engine or _worker_engine
+    return "".join(
+        ndjson_line(user_id, engine.top_jobs(skill_ids, limit) if skill_ids else [])
+        for user_id, skill_ids in users
+    )
+
+
+def stream_recommendations_ndjson(
+    engine: RecommendationEngine,
+    users: List[UserSkills],
+    limit: int = 10,
+    workers: Optional[int] = None,
+    chunk_size: int = 500
+) -> Iterator[str]:
+    """
+    Yield recommendations for many users as NDJSON, one line per user, in
+    the order of `users`.
+
+    Users are split into chunks that are scored across a process pool; each
+    worker receives the job matrix once at start-up. At most two chunks per
+    worker are in flight so memory stays bounded however many users there
+    are. Small batches are scored in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [users[i:i + chunk_size] for i in range(0, len(users), chunk_size)]
+
+    if workers == 1 or len(users) < MIN_USERS_FOR_POOL:
+        for chunk in chunks:
+            yield _recommend_chunk(chunk, limit, engine)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(engine,)) as pool:
+        pending = deque()
+        remaining = iter(chunks)
+        for chunk in remaining:
+            pending.append(pool.submit(_recommend_chunk, chunk, limit))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            yield pending.popleft().result()
+            for chunk in remaining:
+                pending.append(pool.submit(_recommend_chunk, chunk, limit))
+                break
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write job recommendations for many users as NDJSON")
+    parser.add_argument("--limit", type=int, default=10, help="jobs per user")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="users per work unit")
+    parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="restrict to these users")
+    parser.add_argument("--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        engine, users = load_batch_inputs(db, args.user_ids)
+    finally:
+        db.close()
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for chunk in stream_recommendations_ndjson(engine, users, args.limit, args.workers, args.chunk_size):
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+# Run with: python -m app.services.batch_recommendations --output digest.ndjson
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.crawl_schedule import CrawlSchedule
+from app.services.sync_pipeline import SyncTask, SyncTaskResult
+
+
+def task_key(task: SyncTask) -> Tuple[str, str]:
+    """(source, query) a search is scheduled under"""
+    return type(task.source).__name__, json.dumps(task.terms, sort_keys=True)
+
+
+class CrawlScheduler:
+    """
+    Adaptive crawl schedule of the job sync's searches.
+
+    Every (source, search terms) pair has its own recrawl interval, stored
+    in crawl_schedules so a restart resumes the schedule instead of
+    crawling everything again. Each crawl measures how fast the search's
+    results change (the share of postings new or changed, per hour since
+    the previous crawl), smoothed across crawls. The next interval is the
+    one expected to find `target_change_rate` of the postings changed,
+    moving by at most a factor of two per crawl and always within the
+    bounds. Each next run is jittered so searches that share an interval
+    drift apart instead of all firing at once.
+    """
+
+    def __init__(
+        self,
+        min_interval_hours: Optional[float] = None,
+        max_interval_hours: Optional[float] = None,
+        initial_interval_hours: Optional[float] = None,
+        target_change_rate: Optional[float] = None,
+        smoothing: float = 0.3,
+        jitter: float = 0.1
+    ):
+        self.min_interval = (min_interval_hours or settings.CRAWL_MIN_INTERVAL_HOURS) * 3600
+        self.max_interval = (max_interval_hours or settings.CRAWL_MAX_INTERVAL_HOURS) * 3600
+        self.initial_interval = (initial_interval_hours or settings.SYNC_INTERVAL_HOURS) * 3600
+        self.target_change_rate = target_change_rate or settings.CRAWL_TARGET_CHANGE_RATE
+        self.smoothing = smoothing
+        self.jitter = jitter
+
+    def _schedules(self, db: Session, keys: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], CrawlSchedule]:
+        sources = {source for source, _ in keys}
+        if not sources:
+            return {}
+        return {
+            (schedule.source, schedule.query): schedule
+            for schedule in db.scalars(select(CrawlSchedule).where(CrawlSchedule.source.in_(sources)))
+        }
+
+    def due_tasks(self, db: Session, tasks: Sequence[SyncTask], now: Optional[datetime] = None) -> List[SyncTask]:
+        """The searches due for a crawl; ones never crawled before are always due"""
+        now = now or datetime.now()
+        schedules = self._schedules(db, [task_key(task) for task in tasks])
+        return [
+            task for task in tasks
+            if task_key(task) not in schedules or schedules[task_key(task)].next_run_at <= now
+        ]
+
+    def _next_interval(self, interval: float, change_rate: float) -> float:
+        if change_rate > 0:
+            target = self.target_change_rate / change_rate * 3600
+            interval = min(2 * interval, max(0.5 * interval, target))
+        else:
+            interval *= 2
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def record(self, db: Session, results: Sequence[SyncTaskResult], now: Optional[datetime] = None) -> None:
+        """Update the schedule of every search crawled, from what its crawl found"""
+        now = now or datetime.now()
+        schedules = self._schedules(db, [task_key(result.task) for result in results])
+        for result in results:
+            source, query = task_key(result.task)
+            schedule = schedules.get((source, query))
+            if schedule is None:
+                schedule = CrawlSchedule(
+                    source=source, query=query, interval_seconds=self.initial_interval, runs=0
+                )
+                db.add(schedule)
+
+            if result.errors and not result.jobs:
+                # Nothing to learn from a failed crawl; retry it soon
+                delay = self.min_interval
+            else:
+                changed = (result.inserted + result.updated) / result.jobs if result.jobs else 0.0
+                # Everything is new on the first crawl, so it says nothing
+                # about how often the results change
+                if schedule.runs and schedule.last_run_at is not None:
+                    hours = max((now - schedule.last_run_at).total_seconds(), 60) / 3600
+                    rate = changed / hours
+                    schedule.change_rate = (
+                        rate if schedule.change_rate is None
+                        else self.smoothing * rate + (1 - self.smoothing) * schedule.change_rate
+                    )
+                    schedule.interval_seconds = self._next_interval(schedule.interval_seconds, schedule.change_rate)
+                schedule.runs += 1
+                delay = schedule.interval_seconds
+
+            schedule.last_run_at = now
+            schedule.next_run_at = now + timedelta(seconds=delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+        db.commit()
+
+
+crawl_scheduler = CrawlScheduler()
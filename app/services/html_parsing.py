@@ -0,0 +1,218 @@
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.config import settings
+
+# C-backed parsers are optional; the fastest one installed is used
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+except ImportError:
+    BeautifulSoup = None
+    SoupStrainer = None
+
+# Indeed page structure, as CSS selectors
+CARD_CSS = "div.jobsearch-SerpJobCard"
+TITLE_CSS = "h2.title"
+COMPANY_CSS = "span.company"
+DESCRIPTION_CSS = "div#jobDescriptionText"
+
+
+def _has_class_xpath(element: str, class_name: str) -> str:
+    return f"{element}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+class SearchCard(NamedTuple):
+    """A job card of a search results page"""
+    title: str
+    company: Optional[str]
+    href: str
+
+
+class HtmlParserBackend:
+    """
+    Extracts what the scrapers need from Indeed pages.
+
+    Backends differ only in the parser they use, so they can be swapped
+    through the HTML_PARSER setting without changing the results.
+    """
+
+    name = ""
+
+    def search_cards(self, html: str, limit: Optional[int] = None) -> List[SearchCard]:
+        """Job cards of a search page, skipping cards without a title link"""
+        raise NotImplementedError("Subclasses must implement search_cards method")
+
+    def job_description(self, html: str) -> Optional[str]:
+        """Text of a job page's description, or None if it has none"""
+        raise NotImplementedError("Subclasses must implement job_description method")
+
+
+class SelectolaxBackend(HtmlParserBackend):
+    """Lexbor-based parser, the fastest of the backends"""
+
+    name = "selectolax"
+
+    def search_cards(self, html: str, limit: Optional[int] = None) -> List[SearchCard]:
+        cards = []
+        for card in SelectolaxParser(html).css(CARD_CSS):
+            if limit is not None and len(cards) >= limit:
+                break
+            title = card.css_first(TITLE_CSS)
+            link = title.css_first("a") if title is not None else None
+            if link is None or not link.attributes.get("href"):
+                continue
+            company = card.css_first(COMPANY_CSS)
+            cards.append(SearchCard(
+                title.text().strip(),
+                company.text().strip() if company is not None else None,
+                link.attributes["href"]
+            ))
+        return cards
+
+    def job_description(self, html: str) -> Optional[str]:
+        description = SelectolaxParser(html).css_first(DESCRIPTION_CSS)
+        return description.text().strip() if description is not None else None
+
+
+class LxmlBackend(HtmlParserBackend):
+    """
+    libxml2-based parser with XPath selectors compiled once per thread.
+
+    The backend is shared by the sync's parse workers, and lxml parsers and
+    XPath objects must not be used by two threads at once, so each thread
+    gets its own.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _compiled(self):
+        local = self._local
+        if not hasattr(local, "parser"):
+            local.parser = lxml_html.HTMLParser(encoding="utf-8")
+            local.cards = etree.XPath("//" + _has_class_xpath("div", "jobsearch-SerpJobCard"))
+            local.title = etree.XPath("(.//" + _has_class_xpath("h2", "title") + ")[1]")
+            local.company = etree.XPath("(.//" + _has_class_xpath("span", "company") + ")[1]")
+            local.link = etree.XPath("(.//a[@href])[1]/@href")
+            local.description = etree.XPath("(//div[@id='jobDescriptionText'])[1]")
+        return local
+
+    def _parse(self, html: str, compiled):
+        if not html.strip():
+            return None
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=compiled.parser)
+
+    def search_cards(self, html: str, limit: Optional[int] = None) -> List[SearchCard]:
+        compiled = self._compiled()
+        tree = self._parse(html, compiled)
+        if tree is None:
+            return []
+        cards = []
+        for card in compiled.cards(tree):
+            if limit is not None and len(cards) >= limit:
+                break
+            title = compiled.title(card)
+            link = compiled.link(title[0]) if title else []
+            if not link:
+                continue
+            company = compiled.company(card)
+            cards.append(SearchCard(
+                title[0].text_content().strip(),
+                company[0].text_content().strip() if company else None,
+                str(link[0])
+            ))
+        return cards
+
+    def job_description(self, html: str) -> Optional[str]:
+        compiled = self._compiled()
+        tree = self._parse(html, compiled)
+        description = compiled.description(tree) if tree is not None else []
+        return description[0].text_content().strip() if description else None
+
+
+class SoupBackend(HtmlParserBackend):
+    """
+    BeautifulSoup fallback. Only the job cards or the description element
+    are built into a tree, and lxml is used underneath when installed.
+    """
+
+    name = "bs4"
+
+    def __init__(self):
+        self._features = "lxml" if lxml_html is not None else "html.parser"
+        # Strainers see the whole class attribute, not single class names
+        self._cards = SoupStrainer("div", class_=re.compile(r"(^|\s)jobsearch-SerpJobCard(\s|$)"))
+        self._description = SoupStrainer("div", id="jobDescriptionText")
+
+    def search_cards(self, html: str, limit: Optional[int] = None) -> List[SearchCard]:
+        soup = BeautifulSoup(html, self._features, parse_only=self._cards)
+        cards = []
+        for card in soup.select(CARD_CSS):
+            if limit is not None and len(cards) >= limit:
+                break
+            title = card.select_one(TITLE_CSS)
+            link = title.find("a", href=True) if title is not None else None
+            if link is None:
+                continue
+            company = card.select_one(COMPANY_CSS)
+            cards.append(SearchCard(
+                title.get_text().strip(),
+                company.get_text().strip() if company is not None else None,
+                link["href"]
+            ))
+        return cards
+
+    def job_description(self, html: str) -> Optional[str]:
+        soup = BeautifulSoup(html, self._features, parse_only=self._description)
+        description = soup.find("div", id="jobDescriptionText")
+        return description.get_text().strip() if description is not None else None
+
+
+BACKENDS = {
+    "selectolax": (SelectolaxBackend, lambda: SelectolaxParser is not None),
+    "lxml": (LxmlBackend, lambda: lxml_html is not None),
+    "bs4": (SoupBackend, lambda: BeautifulSoup is not None),
+}
+
+_backends: Dict[str, HtmlParserBackend] = {}
+
+
+def available_backends() -> List[str]:
+    """Names of the installed backends, fastest first"""
+    return [name for name, (_, is_available) in BACKENDS.items() if is_available()]
+
+
+def get_html_parser(name: Optional[str] = None) -> HtmlParserBackend:
+    """
+    The parser backend called `name`, or the one chosen by the HTML_PARSER
+    setting; "auto" picks the fastest one installed.
+    """
+    name = name or settings.HTML_PARSER
+    if name == "auto":
+        available = available_backends()
+        if not available:
+            raise RuntimeError("No HTML parser installed: install selectolax, lxml or beautifulsoup4")
+        name = available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser: {name}")
+    backend_class, is_available = BACKENDS[name]
+    if not is_available():
+        raise RuntimeError(f"HTML parser {name} is not installed")
+    if name not in _backends:
+        _backends[name] = backend_class()
+    return _backends[name]
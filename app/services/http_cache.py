@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class CachedPage(NamedTuple):
+    """A stored response body with the validators to revalidate it"""
+    body: bytes
+    headers: Dict[str, str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class HttpCache:
+    """
+    Persistent, size-bounded cache of HTTP response bodies for conditional
+    GETs.
+
+    Only responses carrying an ETag or Last-Modified header are stored,
+    since nothing else can be revalidated. Entries live in a SQLite file
+    and are keyed by a hash of the URL, so API keys in query strings are
+    never written to disk. Once the stored bodies exceed `max_bytes`, the
+    least recently used entries are evicted.
+
+    The total size is kept as a running count instead of summed per write,
+    and access times are buffered in memory and written `flush_every` at a
+    time (and before any eviction), so a read is a single SELECT. The
+    methods block; async callers run them in a thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, flush_every: int = 100):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " key TEXT PRIMARY KEY, body BLOB NOT NULL, headers TEXT NOT NULL,"
+            " etag TEXT, last_modified TEXT, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._conn.commit()
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        key = self._key(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, etag, last_modified FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.flush_every:
+                self._flush_accessed()
+                self._conn.commit()
+        body, headers, etag, last_modified = row
+        return CachedPage(body, json.loads(headers), etag, last_modified)
+
+    def put(self, url: str, body: bytes, headers: Dict[str, str]) -> None:
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        if len(body) > self.max_bytes:
+            return
+        kept = {name: value for name, value in headers.items() if name in ("content-type", "etag", "last-modified")}
+        key = self._key(url)
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (key, body, headers, etag, last_modified, size, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, json.dumps(kept), etag, last_modified, len(body), time.time())
+            )
+            self._accessed.pop(key, None)
+            self._total += len(body) - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE pages SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._accessed = {}
+
+    def _evict(self) -> None:
+        self._flush_accessed()
+        # Evict down to 90% so a full cache does not evict on every put
+        target = self.max_bytes * 0.9
+        for key, size in self._conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall():
+            if self._total <= target:
+                break
+            self._conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self._total -= size
+
+    def flush(self) -> None:
+        """Write the buffered access times"""
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+            self._accessed = {}
+            self._total = 0
+
+
+_http_cache: Optional[HttpCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """The shared cache, opened on first use; None when HTTP_CACHE_PATH is empty"""
+    global _http_cache
+    if not settings.HTTP_CACHE_PATH:
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(settings.HTTP_CACHE_PATH, settings.HTTP_CACHE_MAX_BYTES)
+        return _http_cache
@@ -0,0 +1,181 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.services.http_cache import HttpCache, get_http_cache
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a page a whole crawl depends on could not be fetched"""
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: allows `rate` requests per second on average
+    and bursts of up to `capacity` requests.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Pooled asyncio HTTP client for scrapers and API collectors.
+
+    Keep-alive connections are reused across requests, at most
+    `max_concurrency` requests are in flight, and every host gets its own
+    token bucket so the crawl is as fast as the politeness budget allows.
+    429 and 5xx responses and transport errors are retried with
+    exponential backoff and jitter, honoring Retry-After (up to
+    `max_retry_after` seconds) when given. A request waiting to retry gives
+    up its concurrency slot meanwhile.
+
+    With an HttpCache, pages fetched before are revalidated with
+    If-None-Match / If-Modified-Since; a 304 is turned into a 200 carrying
+    the cached body, which is_not_modified() recognizes so callers can
+    skip re-parsing it.
+
+    Use as an async context manager:
+
+        async with AsyncFetcher(headers=...) as fetcher:
+            pages = await fetcher.fetch_many(urls)
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        max_retry_after: Optional[float] = None,
+        backoff_base: float = 1.0,
+        timeout: float = 30.0,
+        cache: Optional[HttpCache] = None,
+        use_cache: bool = True
+    ):
+        self.headers = headers or {}
+        self.max_concurrency = max_concurrency or settings.SCRAPER_MAX_CONCURRENCY
+        self.requests_per_second = requests_per_second or settings.SCRAPER_REQUESTS_PER_SECOND
+        self.burst = burst or settings.SCRAPER_BURST
+        self.max_retries = settings.SCRAPER_MAX_RETRIES if max_retries is None else max_retries
+        self.max_retry_after = settings.SCRAPER_MAX_RETRY_AFTER_SECONDS if max_retry_after is None else max_retry_after
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.cache = cache or (get_http_cache() if use_cache else None)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
+        if self.cache:
+            await asyncio.to_thread(self.cache.flush)
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).hostname or ""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        return bucket
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_retry_after)
+        return self.backoff_base * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    async def fetch(self, url: str, params: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        GET `url`, retrying rate-limited and failed attempts, and
+        revalidating a cached copy if there is one.
+
+        Returns:
+        Optional[httpx.Response]: The last response received, or None if
+        every attempt failed without one
+        """
+        # httpx.URL(url, params=...) would replace the query string of `url`
+        cache_key = str(httpx.URL(url).copy_merge_params(params or {}))
+        # SQLite calls block, so they run off the event loop
+        cached = await asyncio.to_thread(self.cache.get, cache_key) if self.cache else None
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            async with self._semaphore:
+                await self._bucket(url).acquire()
+                try:
+                    response = await self._client.get(url, params=params, headers=headers)
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                except httpx.TransportError as e:
+                    if attempt == self.max_retries:
+                        print(f"Error fetching {url}: {str(e)}")
+                        return None
+            # Back off outside the semaphore so other requests keep going
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, response))
+
+        if response is not None and response.status_code == 304 and cached is not None:
+            return httpx.Response(
+                200,
+                headers=cached.headers,
+                content=cached.body,
+                request=response.request,
+                extensions={"not_modified": True}
+            )
+        if response is not None and response.status_code == 200 and self.cache:
+            await asyncio.to_thread(self.cache.put, cache_key, response.content, dict(response.headers))
+        return response
+
+    async def fetch_many(self, urls: Sequence[str]) -> List[Optional[httpx.Response]]:
+        """Fetch many URLs concurrently; results are in the order of `urls`"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+
+def is_not_modified(response: Optional[httpx.Response]) -> bool:
+    """Whether `response` is a cached body the server confirmed unchanged"""
+    return response is not None and response.extensions.get("not_modified", False)
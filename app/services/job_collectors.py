@@ -1,11 +1,20 @@
-from typing import List, Dict, Any, Optional
-import requests
-import json
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
+import math
+import re
+import httpx
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.job import Job
-from app.models.skill import Skill
-from app.services.job_scrapers import JobScraper
+from app.services.http_fetch import AsyncFetcher, FetchError, is_not_modified
+from app.services.job_fingerprint import job_source_key
+from app.services.job_persistence import load_jobs, touch_jobs, upsert_jobs
+
+# Largest page the Adzuna API serves
+ADZUNA_MAX_RESULTS_PER_PAGE = 50
+# Same test as `"remote" in description.lower()`, without copying the text
+REMOTE_PATTERN = re.compile("remote", re.IGNORECASE)
 
 class APIJobCollector:
     """Base class for collecting jobs from APIs"""
@@ -15,41 +24,9 @@ class APIJobCollector:
         self.api_key = api_key
     
     def save_job(self, job_data: Dict[str, Any]) -> Job:
-        """Save job to database with associated skills"""
-        # Create job instance
-        db_job = Job(
-            title=job_data["title"],
-            company=job_data["company"],
-            location=job_data["location"],
-            description=job_data["description"],
-            salary_min=job_data.get("salary_min"),
-            salary_max=job_data.get("salary_max"),
-            job_type=job_data.get("job_type", "Full-time"),
-            remote=job_data.get("remote", False),
-            url=job_data["url"],
-            source=job_data["source"],
-            posted_date=job_data.get("posted_date", datetime.now())
-        )
-        
-        # Process skills
-        if "skills" in job_data and job_data["skills"]:
-            for skill_name in job_data["skills"]:
-                # Find or create skill
-                skill = self.db.query(Skill).filter(Skill.name == skill_name).first()
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    self.db.add(skill)
-                    self.db.commit()
-                
-                # Add skill to job
-                db_job.required_skills.append(skill)
-        
-        # Save to database
-        self.db.add(db_job)
-        self.db.commit()
-        self.db.refresh(db_job)
-        
-        return db_job
+        """Save job to database with associated skills, updating it if already collected"""
+        result = upsert_jobs(self.db, [job_data])
+        return self.db.get(Job, result.job_ids[0])
     
     def collect_jobs(self) -> List[Job]:
         """
@@ -61,10 +38,10 @@ class APIJobCollector:
 class AdzunaJobCollector(APIJobCollector):
     """Collect jobs from Adzuna API"""
     
-    def __init__(self, db: Session, app_id: str, api_key: str):
+    def __init__(self, db: Session, app_id: str, api_key: str, base_url: Optional[str] = None):
         super().__init__(db, api_key)
         self.app_id = app_id
-        self.base_url = "https://api.adzuna.com/v1/api/jobs"
+        self.base_url = base_url or settings.ADZUNA_BASE_URL
     
     def collect_jobs(
         self, 
@@ -72,70 +49,173 @@ class AdzunaJobCollector(APIJobCollector):
         keywords: str = "software developer", 
         location: str = "", 
         page: int = 1, 
-        results_per_page: int = 20
+        results_per_page: Optional[int] = None,
+        max_pages: Optional[int] = None
     ) -> List[Job]:
         """
-        Collect jobs from Adzuna API
+        Collect jobs from Adzuna API, paging through the results
+        
+        The first page tells how many results there are; the pages after it
+        are fetched concurrently through one pooled client, within the API's
+        rate budget, and each page is saved as soon as it arrives. A page
+        that fails is skipped without losing the others.
         
         Parameters:
         country (str): Country code (us, gb, etc.)
         keywords (str): Search keywords
         location (str): Location filter
-        page (int): Page number
-        results_per_page (int): Number of results per page
+        page (int): First page to fetch
+        results_per_page (int): Number of results per page (at most 50)
+        max_pages (int): Most pages to fetch (default ADZUNA_MAX_PAGES)
         
         Returns:
         List[Job]: List of jobs saved to database
         """
-        url = f"{self.base_url}/{country}/search/{page}"
+        terms = {
+            "country": country,
+            "keywords": keywords,
+            "location": location,
+            "page": page,
+            "results_per_page": results_per_page,
+            "max_pages": max_pages
+        }
+        try:
+            job_ids = asyncio.run(self._collect_pages(terms))
+            return load_jobs(self.db, list(dict.fromkeys(job_ids)))
+        except Exception as e:
+            print(f"Error collecting jobs from Adzuna: {str(e)}")
+            return []
+    
+    def create_fetcher(self) -> AsyncFetcher:
+        """Pooled client for the API's requests, within its rate budget"""
+        return AsyncFetcher(requests_per_second=settings.ADZUNA_REQUESTS_PER_SECOND)
+    
+    async def _collect_pages(self, terms: Dict[str, Any]) -> List[int]:
+        """Fetch and save the pages of one search; returns the ids of the jobs saved"""
+        job_ids: List[int] = []
+        async with self.create_fetcher() as fetcher:
+            async for number, response in self.fetch_pages(fetcher, **terms):
+                try:
+                    # Saved off the event loop so the other pages keep
+                    # downloading meanwhile; the session is only ever used
+                    # by one page at a time
+                    job_ids.extend(await asyncio.to_thread(self._save_page, number, response))
+                except Exception as e:
+                    print(f"Error collecting Adzuna page {number}: {str(e)}")
+        return job_ids
+    
+    async def fetch_pages(
+        self,
+        fetcher: AsyncFetcher,
+        keywords: str = "software developer",
+        location: str = "",
+        country: str = "us",
+        page: int = 1,
+        results_per_page: Optional[int] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, httpx.Response]]:
+        """
+        Fetch the first results page, which tells how many results there
+        are, then the pages after it concurrently, yielding each page as
+        it arrives. Pages after the first that fail are skipped.
         
+        Raises:
+        FetchError: If the first page could not be fetched or decoded, so
+        the crawl is not mistaken for one that found nothing changed
+        """
+        url = f"{self.base_url}/{country}/search/{{}}"
         params = {
             "app_id": self.app_id,
             "app_key": self.api_key,
-            "results_per_page": results_per_page,
+            "results_per_page": min(results_per_page or settings.ADZUNA_RESULTS_PER_PAGE, ADZUNA_MAX_RESULTS_PER_PAGE),
             "what": keywords
         }
         
         if location:
             params["where"] = location
         
-        saved_jobs = []
+        async def fetch_page(number):
+            response = await fetcher.fetch(url.format(number), params=params)
+            if response is None or response.status_code != 200:
+                status = response.status_code if response is not None else "no response"
+                print(f"Error collecting Adzuna page {number}: {status}")
+                return number, None
+            return number, response
         
+        _, response = await fetch_page(page)
+        if response is None:
+            raise FetchError(f"Adzuna page {page} for {keywords} could not be fetched")
         try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                
-                for job_data in data.get("results", []):
-                    # Extract job details
-                    description = job_data.get("description", "")
-                    
-                    # Extract skills using NLP (simplified here)
-                    scraper = JobScraper(self.db)
-                    skills = scraper.extract_skills_from_description(description)
-                    
-                    # Format job data
-                    formatted_job = {
-                        "title": job_data.get("title", ""),
-                        "company": job_data.get("company", {}).get("display_name", "Unknown"),
-                        "location": job_data.get("location", {}).get("display_name", ""),
-                        "description": description,
-                        "url": job_data.get("redirect_url", ""),
-                        "source": "Adzuna API",
-                        "remote": "remote" in description.lower(),
-                        "job_type": "Full-time",  # Default
-                        "salary_min": job_data.get("salary_min"),
-                        "salary_max": job_data.get("salary_max"),
-                        "posted_date": datetime.strptime(job_data.get("created", ""), "%Y-%m-%dT%H:%M:%SZ") 
-                                      if "created" in job_data else datetime.now(),
-                        "skills": skills
-                    }
-                    
-                    # Save to database
-                    saved_job = self.save_job(formatted_job)
-                    saved_jobs.append(saved_job)
+            total = response.json().get("count", 0)
+        except ValueError as e:
+            raise FetchError(f"Adzuna page {page} for {keywords} is not valid JSON: {str(e)}")
+        yield page, response
         
-        except Exception as e:
-            print(f"Error collecting jobs from Adzuna: {str(e)}")
+        # Stop at the last page that has results
+        pages = min(max_pages or settings.ADZUNA_MAX_PAGES, math.ceil(total / params["results_per_page"]))
+        for fetched in asyncio.as_completed([fetch_page(number) for number in range(page + 1, page + pages)]):
+            number, response = await fetched
+            if response is not None:
+                yield number, response
+    
+    def parse_page(self, number: int, response: httpx.Response, **terms) -> List[Dict[str, Any]]:
+        """The jobs of a results page, as the job data upsert_jobs expects"""
+        collected_at = datetime.now()
+        return [format_adzuna_job(job_data, collected_at) for job_data in response.json().get("results", [])]
+    
+    def page_source_keys(self, number: int, response: httpx.Response, **terms) -> List[str]:
+        """Source keys of the jobs of a results page, without formatting them"""
+        return [
+            job_source_key({
+                "url": job_data.get("redirect_url", ""),
+                "source": "Adzuna API",
+                "title": job_data.get("title", ""),
+                "company": (job_data.get("company") or {}).get("display_name", "Unknown")
+            })
+            for job_data in response.json().get("results", [])
+        ]
+    
+    def _save_page(self, number: int, response: httpx.Response) -> List[int]:
+        # Skills are extracted in one batch by the upsert, and only for new
+        # or changed postings
+        collected = self.parse_page(number, response)
+        
+        # A page the API reports unchanged only needs its jobs marked as
+        # seen; anything not stored yet still goes through the upsert
+        seen = {}
+        if is_not_modified(response):
+            seen = touch_jobs(self.db, [job_source_key(job) for job in collected])
+            collected = [job for job in collected if job_source_key(job) not in seen]
         
-        return saved_jobs
+        # Save the whole page in one transaction
+        result = upsert_jobs(self.db, collected)
+        print(f"Adzuna: {result.inserted} new, {result.updated} updated, {result.unchanged + len(seen)} unchanged, {result.duplicates} duplicates")
+        return list(seen.values()) + result.job_ids
+
+
+def parse_adzuna_date(created: Optional[str], default: datetime) -> datetime:
+    """Parse Adzuna's "2024-01-31T12:00:00Z" timestamps as naive datetimes"""
+    if not created:
+        return default
+    try:
+        return datetime.fromisoformat(created[:-1] if created.endswith("Z") else created).replace(tzinfo=None)
+    except ValueError:
+        return default
+
+
+def format_adzuna_job(job_data: Dict[str, Any], collected_at: datetime) -> Dict[str, Any]:
+    """Turn one Adzuna result into the job data upsert_jobs expects"""
+    description = job_data.get("description", "")
+    return {
+        "title": job_data.get("title", ""),
+        "company": (job_data.get("company") or {}).get("display_name", "Unknown"),
+        "location": (job_data.get("location") or {}).get("display_name", ""),
+        "description": description,
+        "url": job_data.get("redirect_url", ""),
+        "source": "Adzuna API",
+        "remote": REMOTE_PATTERN.search(description) is not None,
+        "job_type": "Full-time",  # Default
+        "salary_min": job_data.get("salary_min"),
+        "salary_max": job_data.get("salary_max"),
+        "posted_date": parse_adzuna_date(job_data.get("created"), collected_at)
+    }
@@ -0,0 +1,164 @@
+import threading
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services.job_fingerprint import normalize_company, normalize_text
+from app.services.minhash import LSHIndex, MinHasher, pack_signature, unpack_signature
+
+# Fixed seed: persisted signatures must stay comparable across restarts
+description_hasher = MinHasher(num_perm=64, seed=20251017)
+
+# Words per shingle of a description
+SHINGLE_SIZE = 5
+
+# Estimated Jaccard similarity of description shingles above which two
+# postings of the same company's role (see same_job) are taken to be the
+# same job
+DUPLICATE_THRESHOLD = 0.9
+
+
+class DuplicateIdentity(NamedTuple):
+    """Normalized company, title and location of a listing"""
+    company: str
+    title: str
+    location: str
+
+
+def duplicate_identity(title: Optional[str], company: Optional[str], location: Optional[str]) -> DuplicateIdentity:
+    return DuplicateIdentity(normalize_company(company), normalize_text(title), normalize_text(location))
+
+
+def same_job(a: DuplicateIdentity, b: DuplicateIdentity) -> bool:
+    """
+    Whether two listings with near-identical descriptions are the same job:
+    same known company and title, and locations that agree as far as both
+    go ("remote" and "remote us" do, "austin tx" and "dallas tx" do not).
+    Boilerplate descriptions or one company's role in several cities are
+    not merged.
+    """
+    if not a.company or a.company == "unknown" or a.company != b.company or a.title != b.title:
+        return False
+    shorter, longer = sorted((a.location, b.location), key=len)
+    return longer.startswith(shorter)
+
+
+def description_shingles(description: Optional[str]) -> List[str]:
+    words = normalize_text(description).split()
+    if len(words) <= SHINGLE_SIZE:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def description_signature(description: Optional[str]) -> Optional[bytes]:
+    """Packed MinHash signature of a description's word shingles"""
+    return pack_signature(description_hasher.signature(description_shingles(description)))
+
+
+class DuplicateJobsIndex:
+    """
+    LSH index over the description signatures of active jobs, to recognize
+    the same posting listed by different sources.
+
+    Uses 8 bands of 8 rows, so only pairs well above 0.7 Jaccard similarity
+    are likely candidates; candidates are then checked against
+    DUPLICATE_THRESHOLD and same_job. Loaded from the persisted `description_minhash`
+    column on first use and kept up to date by index_job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lsh = LSHIndex(bands=8, rows=8)
+        self.identities: Dict[int, DuplicateIdentity] = {}
+        self.is_loaded = False
+
+    def refresh(self, db: Session) -> None:
+        with self._lock:
+            backfill_description_signatures(db)
+            self.lsh.clear()
+            self.identities = {}
+            rows = db.execute(
+                select(Job.id, Job.description_minhash, Job.title, Job.company, Job.location)
+                .where(Job.is_active == True, Job.description_minhash.isnot(None))
+            )
+            for job_id, data, title, company, location in rows:
+                self.identities[job_id] = duplicate_identity(title, company, location)
+                self.lsh.add(job_id, unpack_signature(data))
+            self.is_loaded = True
+
+    def add_job(self, job: Job) -> None:
+        if not self.is_loaded:
+            return
+        signature = unpack_signature(job.description_minhash)
+        if job.is_active and signature is not None:
+            self.identities[job.id] = duplicate_identity(job.title, job.company, job.location)
+            self.lsh.add(job.id, signature)
+        else:
+            self.lsh.remove(job.id)
+            self.identities.pop(job.id, None)
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> None:
+        if not self.is_loaded:
+            return
+        for job_id in job_ids:
+            self.lsh.remove(job_id)
+            self.identities.pop(job_id, None)
+
+    def find(self, signature: Optional[np.ndarray], identity: DuplicateIdentity) -> Optional[int]:
+        """Id of the active job the listing with `signature` and `identity` duplicates, if any"""
+        if signature is None:
+            return None
+        return find_duplicate(self.lsh, signature, identity, self.identities)
+
+
+def find_duplicate(
+    lsh: LSHIndex,
+    signature: np.ndarray,
+    identity: DuplicateIdentity,
+    identities: Mapping[int, DuplicateIdentity]
+) -> Optional[int]:
+    """
+    Most similar key in `lsh` at or above DUPLICATE_THRESHOLD that is the
+    same job as `identity` by `identities`, if any
+    """
+    for key, similarity in lsh.query(signature, limit=None):
+        if similarity < DUPLICATE_THRESHOLD:
+            break
+        if key in identities and same_job(identity, identities[key]):
+            return key
+    return None
+
+
+duplicate_jobs_index = DuplicateJobsIndex()
+
+
+def get_duplicate_jobs_index(db: Optional[Session] = None) -> DuplicateJobsIndex:
+    """Return the shared index, loading it from the database on first use"""
+    if not duplicate_jobs_index.is_loaded and db is not None:
+        duplicate_jobs_index.refresh(db)
+    return duplicate_jobs_index
+
+
+def backfill_description_signatures(db: Session, batch_size: int = 1000) -> int:
+    """Compute signatures for active jobs saved before they were persisted"""
+    updated = 0
+    last_id = 0
+    while True:
+        jobs = (
+            db.query(Job)
+            .filter(Job.is_active == True, Job.description_minhash.is_(None), Job.id > last_id)
+            .order_by(Job.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not jobs:
+            break
+        for job in jobs:
+            job.description_minhash = description_signature(job.description)
+        db.commit()
+        last_id = jobs[-1].id
+        updated += len(jobs)
+    return updated
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "referrer", "trk", "src"}
+
+# Legal-form suffixes dropped from company names before comparing them
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "plc", "pvt"}
+
+
+def _salary(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def job_content_hash(job_data: Dict[str, Any]) -> str:
+    """
+    SHA-256 fingerprint of the content of scraped or collected job data:
+    description, location, salary range, job type and remote flag.
+
+    Defaults match the ones used when the job is saved, so a missing field
+    and its default hash the same.
+    """
+    content = [
+        job_data.get("description") or "",
+        job_data.get("location") or "",
+        _salary(job_data.get("salary_min")),
+        _salary(job_data.get("salary_max")),
+        job_data.get("job_type", "Full-time"),
+        bool(job_data.get("remote", False)),
+    ]
+    encoded = json.dumps(content, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def canonical_url(url: str) -> str:
+    """
+    URL normalized so that links to the same posting compare equal: no
+    scheme, fragment, "www." prefix, default port, trailing slash or
+    tracking parameters, and the remaining query parameters sorted.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/")
+    return host + path + ("?" + urlencode(query) if query else "")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase ASCII words separated by single spaces"""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def normalize_company(company: Optional[str]) -> str:
+    words = normalize_text(company).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def job_source_key(job_data: Dict[str, Any]) -> str:
+    """
+    Unique key of a job posting within its source: a hash of its canonical
+    URL, or of its source, title and company when it has no URL. Re-scrapes
+    of the same posting map to the same row.
+    """
+    url = job_data.get("url") or ""
+    if url:
+        text = "url:" + canonical_url(url)
+    else:
+        parts = (job_data.get("source") or "", job_data.get("title") or "", job_data.get("company") or "")
+        text = "job:" + "\x1f".join(parts).lower()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def job_posting_key(job_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Source-independent key of a posting: a hash of its normalized title,
+    company and location, so the same job listed by Indeed and Adzuna gets
+    the same key. None when the title or company is missing.
+    """
+    title = normalize_text(job_data.get("title"))
+    company = normalize_company(job_data.get("company"))
+    if not title or not company or company == "unknown":
+        return None
+    text = "posting:" + "\x1f".join((title, company, normalize_text(job_data.get("location"))))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
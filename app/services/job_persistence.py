@@ -0,0 +1,289 @@
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import delete, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.services.job_dedup import DuplicateIdentity, description_signature, duplicate_identity, find_duplicate, get_duplicate_jobs_index
+from app.services.job_fingerprint import job_content_hash, job_posting_key, job_source_key
+from app.services.job_similarity import skill_signature
+from app.services.minhash import LSHIndex, unpack_signature
+from app.services.skill_extraction import extract_skills_batch
+from app.services.skill_index import index_jobs
+from app.services.skill_matcher import get_skill_matcher
+from app.services.skill_resolver import skill_resolver
+
+# Rows per multi-row INSERT statement
+UPSERT_CHUNK_SIZE = 500
+
+# Columns rewritten when the content of a known posting changed
+# (posting_key is kept from the first insert so an update can never collide
+# with another row's key)
+UPDATE_COLUMNS = (
+    "description", "location", "salary_min", "salary_max", "job_type", "remote",
+    "content_hash", "skill_minhash", "description_minhash", "is_active", "retired_at", "updated_at", "last_seen_at"
+)
+
+
+class JobUpsertResult(NamedTuple):
+    """Outcome of upsert_jobs"""
+    job_ids: List[int]  # One per input job, in input order
+    inserted: int
+    updated: int
+    unchanged: int
+    duplicates: int  # Collapsed into a job from another listing or source
+
+
+def _job_row(job_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    return {
+        "title": job_data["title"],
+        "company": job_data["company"],
+        "location": job_data["location"],
+        "description": job_data["description"],
+        "salary_min": job_data.get("salary_min"),
+        "salary_max": job_data.get("salary_max"),
+        "job_type": job_data.get("job_type", "Full-time"),
+        "remote": job_data.get("remote", False),
+        "url": job_data["url"],
+        "source": job_data["source"],
+        "posted_date": job_data.get("posted_date", now),
+        "is_active": True,
+        "retired_at": None,
+        "source_key": job_data.get("source_key") or job_source_key(job_data),
+        "posting_key": job_posting_key(job_data),
+        "content_hash": job_data.get("content_hash") or job_content_hash(job_data),
+        "updated_at": now,
+        "last_seen_at": now,
+    }
+
+
+def _find_duplicates(
+    db: Session,
+    rows: Dict[str, Dict[str, Any]],
+    new_keys: List[str]
+) -> Tuple[Dict[str, Tuple[int, bool]], Dict[str, str]]:
+    """
+    Match postings not stored under their source key against other
+    listings of the same job: first by posting key, then by near-duplicate
+    description of the same company's same role (see same_job), among
+    stored jobs and earlier postings of the batch.
+
+    Returns:
+    Tuple: {key: (job id, is active)} for duplicates of stored jobs, and
+    {key: key of the first posting} for duplicates within the batch
+    """
+    posting_keys = [rows[key]["posting_key"] for key in new_keys if rows[key]["posting_key"]]
+    owners = {}
+    if posting_keys:
+        owners = {
+            posting_key: (job_id, is_active)
+            for posting_key, job_id, is_active in db.execute(
+                select(Job.posting_key, Job.id, Job.is_active).where(Job.posting_key.in_(posting_keys))
+            )
+        }
+    index = get_duplicate_jobs_index(db)
+
+    stored: Dict[str, Tuple[int, bool]] = {}
+    in_batch: Dict[str, str] = {}
+    batch_posting_keys: Dict[str, str] = {}
+    batch_lsh = LSHIndex(bands=index.lsh.bands, rows=index.lsh.rows)
+    batch_identities: Dict[int, DuplicateIdentity] = {}
+    for position, key in enumerate(new_keys):
+        posting_key = rows[key]["posting_key"]
+        signature = unpack_signature(rows[key]["description_minhash"])
+        identity = duplicate_identity(rows[key]["title"], rows[key]["company"], rows[key]["location"])
+        if posting_key in owners:
+            stored[key] = owners[posting_key]
+            continue
+        job_id = index.find(signature, identity)
+        if job_id is not None:
+            # The duplicate index only holds active jobs
+            stored[key] = (job_id, True)
+            continue
+        if posting_key in batch_posting_keys:
+            in_batch[key] = batch_posting_keys[posting_key]
+            continue
+        if signature is not None:
+            leader = find_duplicate(batch_lsh, signature, identity, batch_identities)
+            if leader is not None:
+                in_batch[key] = new_keys[leader]
+                continue
+            batch_identities[position] = identity
+            batch_lsh.add(position, signature)
+        if posting_key:
+            batch_posting_keys[posting_key] = key
+    return stored, in_batch
+
+
+def upsert_jobs(db: Session, jobs: Sequence[Dict[str, Any]]) -> JobUpsertResult:
+    """
+    Save many scraped or collected jobs at once, keyed on their source key.
+
+    Postings whose content hash is already stored are only marked as seen.
+    New and changed ones have their skills extracted in one batch (unless
+    given as job_data["skills"]) and are written with INSERT ... ON
+    CONFLICT DO UPDATE, their job_skill links replaced in bulk, all in one
+    transaction. Skills that do not exist yet are created just before it.
+    The in-memory indexes are updated once the transaction commits.
+
+    A new posting that is another listing of a known job (same posting key
+    or a near-identical description, from any source) is not inserted; the
+    job it duplicates is marked as seen instead.
+    """
+    now = datetime.now()
+    rows: Dict[str, Dict[str, Any]] = {}
+    skills: Dict[str, List[str]] = {}
+    order: List[str] = []
+    for job_data in jobs:
+        row = _job_row(job_data, now)
+        key = row["source_key"]
+        order.append(key)
+        # A posting listed twice in one batch keeps its last version
+        rows[key] = row
+        skills.pop(key, None)
+        if job_data.get("skills") is not None:
+            skills[key] = list(job_data["skills"])
+    if not rows:
+        return JobUpsertResult([], 0, 0, 0, 0)
+
+    existing = {
+        key: (job_id, content_hash, is_active)
+        for key, job_id, content_hash, is_active in db.execute(
+            select(Job.source_key, Job.id, Job.content_hash, Job.is_active)
+            .where(Job.source_key.in_(list(rows)))
+        )
+    }
+    job_ids: Dict[str, int] = {}
+    unchanged_ids: List[int] = []
+    reactivated_ids: List[int] = []
+    for key, row in rows.items():
+        if key in existing and existing[key][1] == row["content_hash"]:
+            job_id, _, is_active = existing[key]
+            job_ids[key] = job_id
+            unchanged_ids.append(job_id)
+            if not is_active:
+                reactivated_ids.append(job_id)
+    for key in rows:
+        if key not in job_ids:
+            rows[key]["description_minhash"] = description_signature(rows[key]["description"])
+
+    # Other listings of jobs already stored, or of earlier postings in the batch
+    stored_duplicates, batch_duplicates = _find_duplicates(
+        db, rows, [key for key in rows if key not in existing]
+    )
+    for key, (job_id, is_active) in stored_duplicates.items():
+        job_ids[key] = job_id
+        unchanged_ids.append(job_id)
+        if not is_active:
+            reactivated_ids.append(job_id)
+    changed = [key for key in rows if key not in job_ids and key not in batch_duplicates]
+
+    # Skills of new and changed postings, extracted and resolved in batches
+    to_extract = [key for key in changed if key not in skills]
+    extracted = extract_skills_batch([rows[key]["description"] for key in to_extract], get_skill_matcher(db))
+    skills.update(zip(to_extract, extracted))
+    skill_ids = skill_resolver.resolve(db, [name for key in changed for name in skills[key]])
+    job_skill_ids = {key: sorted({skill_ids[name] for name in skills[key]}) for key in changed}
+    for key in changed:
+        rows[key]["skill_minhash"] = skill_signature(job_skill_ids[key])
+
+    inserted_ids: List[int] = []
+    updated_ids: List[int] = []
+    try:
+        for start in range(0, len(changed), UPSERT_CHUNK_SIZE):
+            chunk = changed[start:start + UPSERT_CHUNK_SIZE]
+            stmt = insert(Job).values([rows[key] for key in chunk])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Job.source_key],
+                set_={column: stmt.excluded[column] for column in UPDATE_COLUMNS}
+            ).returning(Job.source_key, Job.id, literal_column("xmax = 0"))
+            for key, job_id, was_inserted in db.execute(stmt):
+                job_ids[key] = job_id
+                (inserted_ids if was_inserted else updated_ids).append(job_id)
+
+        if updated_ids:
+            db.execute(delete(job_skill).where(job_skill.c.job_id.in_(updated_ids)))
+        links = [
+            {"job_id": job_ids[key], "skill_id": skill_id}
+            for key in changed
+            for skill_id in job_skill_ids[key]
+        ]
+        if links:
+            db.execute(insert(job_skill).values(links).on_conflict_do_nothing())
+
+        for key, leader in batch_duplicates.items():
+            job_ids[key] = job_ids[leader]
+
+        if unchanged_ids:
+            db.execute(
+                update(Job)
+                .where(Job.id.in_(unchanged_ids))
+                .values(last_seen_at=now, is_active=True, retired_at=None)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    reindex_ids = inserted_ids + updated_ids + reactivated_ids
+    if reindex_ids:
+        index_jobs(db.query(Job).options(selectinload(Job.required_skills)).filter(Job.id.in_(reindex_ids)))
+
+    return JobUpsertResult(
+        [job_ids[key] for key in order],
+        len(inserted_ids),
+        len(updated_ids),
+        len(unchanged_ids) - len(stored_duplicates),
+        len(stored_duplicates) + len(batch_duplicates)
+    )
+
+
+def touch_jobs(db: Session, source_keys: Sequence[str]) -> Dict[str, int]:
+    """
+    Mark stored postings as seen without rewriting them, e.g. when their
+    page was not modified since the last fetch.
+
+    Returns:
+    Dict[str, int]: Job id of each source key that is stored
+    """
+    if not source_keys:
+        return {}
+    found = {
+        key: (job_id, is_active)
+        for key, job_id, is_active in db.execute(
+            select(Job.source_key, Job.id, Job.is_active).where(Job.source_key.in_(list(source_keys)))
+        )
+    }
+    if not found:
+        return {}
+    db.execute(
+        update(Job)
+        .where(Job.id.in_([job_id for job_id, _ in found.values()]))
+        .values(last_seen_at=datetime.now(), is_active=True, retired_at=None)
+    )
+    db.commit()
+
+    reactivated_ids = [job_id for job_id, is_active in found.values() if not is_active]
+    if reactivated_ids:
+        index_jobs(db.query(Job).options(selectinload(Job.required_skills)).filter(Job.id.in_(reactivated_ids)))
+    return {key: job_id for key, (job_id, _) in found.items()}
+
+
+def stored_content_hashes(db: Session, source_keys: Sequence[str]) -> Dict[str, str]:
+    """Content hash of each source key that is stored"""
+    if not source_keys:
+        return {}
+    return dict(db.execute(
+        select(Job.source_key, Job.content_hash).where(Job.source_key.in_(list(source_keys)))
+    ).all())
+
+
+def load_jobs(db: Session, job_ids: Sequence[int]) -> List[Job]:
+    """Jobs by id in the order given, loaded in one query"""
+    if not job_ids:
+        return []
+    by_id = {job.id: job for job in db.query(Job).filter(Job.id.in_(set(job_ids)))}
+    return [by_id[job_id] for job_id in job_ids if job_id in by_id]
@@ -1,60 +1,309 @@
+import base64
+import json
+from sqlalchemy import Float, and_, cast, func, select
 from sqlalchemy.orm import Session
-from typing import List
-from app.models.user import User
+from typing import List, Optional, Set, Tuple
+from app.core.config import settings
+from app.models.user import User, user_skill
 from app.models.job import Job
-from app.schemas.job import Job as JobSchema
+from app.models.skill import job_skill
+from app.models.user_job_score import UserJobScore
+from app.schemas.job import Job as JobSchema, RecommendationFilters
+from app.services.job_serialization import load_job_dicts
+from app.services.recommendation_cache import estimate_jobs_size, recommendation_cache
+from app.services.recommendation_engine import get_recommendation_engine
+from app.services.recommendation_filters import Keyset, filters_key, is_empty, sql_after, sql_conditions
+from app.services.skill_index import get_skill_index
 
-def get_recommended_jobs(db: Session, user: User, limit: int = 10) -> List[JobSchema]:
+# (match_score, job_id, offset) of the last job of the previous page
+CursorPosition = Tuple[float, int, int]
+
+class InvalidCursorError(ValueError):
+    """Raised when a recommendation cursor cannot be decoded"""
+
+def get_recommended_jobs(
+    db: Session,
+    user: User,
+    limit: int = 10,
+    filters: Optional[RecommendationFilters] = None
+) -> List[JobSchema]:
     """
     Get job recommendations for a user based on their skills.
-    
+
     Algorithm:
     1. Get user skills
-    2. Find jobs that require these skills
-    3. Calculate match score based on overlap of user skills and job required skills
-    4. Sort jobs by match score
-    5. Return top N jobs
-    
+    2. Score active jobs with the configured backend (RECOMMENDATION_BACKEND):
+       - "index": only jobs in the postings of the user's skills, kept in a
+         bounded heap (see SkillJobIndex)
+       - "memory": one sparse mat-vec against the in-memory job x skill
+         matrix (see RecommendationEngine)
+       - "database": a grouped top-k query over user_skill/job_skill
+       - "precomputed": an indexed read of the user's rows in
+         user_job_scores (see score_store), capped at
+         RECOMMENDATION_PRECOMPUTE_TOP_N jobs; filtered requests are
+         scored in the database instead, since the stored top jobs are
+         unfiltered
+    3. Match score is the percentage of the job's required skills the user has
+    4. Drop jobs not matching the filters, then keep the top N jobs by match
+       score (ties broken by job id)
+    5. Load and return only those N jobs
+
     Parameters:
     db (Session): Database session
     user (User): User model instance
     limit (int): Maximum number of jobs to return
-    
+    filters (RecommendationFilters): Optional remote/location/job type/salary/source filters
+
     Returns:
     List[JobSchema]: List of recommended jobs with match scores
     """
-    # Get all active jobs
-    all_jobs = db.query(Job).filter(Job.is_active == True).all()
-    
+    job_matches, _ = get_recommendation_page(db, user, limit, filters)
+    return job_matches
+
+def get_recommendation_page(
+    db: Session,
+    user: User,
+    limit: int = 10,
+    filters: Optional[RecommendationFilters] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[JobSchema], Optional[str]]:
+    """
+    Get one page of recommendations and the cursor of the next page.
+
+    The first page ranks RECOMMENDATION_PREFETCH_PAGES pages at once and
+    caches that ranking, so following pages are sliced from it instead of
+    being rescored. Once the ranking is gone (evicted, or invalidated by a
+    skill or catalog change) the cursor still works as a keyset position
+    (match score, job id) for a fresh top-k.
+
+    Returns:
+    Tuple[List[JobSchema], Optional[str]]: The page and the next page's
+    cursor, None when there are no more recommendations
+
+    Raises:
+    InvalidCursorError: If the cursor is malformed
+    """
+    position = decode_cursor(cursor) if cursor else None
+
+    # Results only change when the user's skills or the job catalog change
+    skill_ids = [skill.id for skill in user.skills]
+    cache_key = recommendation_cache.key(user.id, skill_ids, "page", limit, filters_key(filters), cursor)
+    cached = recommendation_cache.get(cache_key)
+    if cached is not None:
+        job_matches, next_cursor = cached
+        return list(job_matches), next_cursor
+
+    page, has_more = _rank_page(db, user, limit, filters, position)
+    job_matches = _load_job_matches(db, page)
+
+    next_cursor = None
+    if has_more and page:
+        offset = (position[2] if position else 0) + len(page)
+        next_cursor = encode_cursor((page[-1][1], page[-1][0], offset))
+
+    recommendation_cache.put(cache_key, (job_matches, next_cursor), estimate_jobs_size(job_matches))
+    return list(job_matches), next_cursor
+
+def encode_cursor(position: CursorPosition) -> str:
+    raw = json.dumps(list(position), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> CursorPosition:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, job_id, offset = json.loads(raw)
+        return float(score), int(job_id), int(offset)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+
+def _rank_page(
+    db: Session,
+    user: User,
+    limit: int,
+    filters: Optional[RecommendationFilters],
+    position: Optional[CursorPosition]
+) -> Tuple[List[Tuple[int, float]], bool]:
+    """Select the (job_id, match_score) pairs of one page and whether more follow"""
+    if limit <= 0:
+        return [], False
+
+    offset = position[2] if position else 0
+    ranking_key = recommendation_cache.key(user.id, [skill.id for skill in user.skills], "ranking", filters_key(filters))
+    cached = recommendation_cache.get(ranking_key)
+    if cached is not None:
+        ranking, complete = cached
+        # Only trust the offset if the ranking still agrees with the cursor
+        if offset == 0 or (0 < offset <= len(ranking) and ranking[offset - 1] == (position[1], position[0])):
+            page = ranking[offset:offset + limit]
+            if len(page) == limit or complete:
+                return page, len(ranking) > offset + limit or not complete
+
+    if position is None:
+        window = limit * max(settings.RECOMMENDATION_PREFETCH_PAGES, 1)
+        ranking = _top_jobs(db, user, window, filters)
+        complete = len(ranking) < window
+        recommendation_cache.put(ranking_key, (ranking, complete), 64 + 64 * len(ranking))
+        return ranking[:limit], len(ranking) > limit
+
+    # Keyset continuation from the last job of the previous page
+    ranking = _top_jobs(db, user, limit + 1, filters, (position[0], position[1]))
+    return ranking[:limit], len(ranking) > limit
+
+def rank_jobs(
+    db: Session,
+    user: User,
+    limit: int,
+    filters: Optional[RecommendationFilters] = None
+) -> List[Tuple[int, float]]:
+    """
+    The user's top (job_id, match_score) pairs from the configured backend,
+    without loading the jobs or touching the cache.
+    """
+    return _top_jobs(db, user, limit, filters)
+
+def _top_jobs(
+    db: Session,
+    user: User,
+    limit: int,
+    filters: Optional[RecommendationFilters] = None,
+    after: Optional[Keyset] = None
+) -> List[Tuple[int, float]]:
+    """Rank jobs with the configured backend"""
+    backend = settings.RECOMMENDATION_BACKEND
+    if backend == "precomputed":
+        # user_job_scores only holds each user's unfiltered top jobs, so
+        # filtering them could miss matches ranked below the cut
+        if is_empty(filters):
+            return _top_jobs_precomputed(db, user, limit, after)
+        backend = "database"
+
     # Get set of user skill IDs for efficient lookup
     user_skill_ids = {skill.id for skill in user.skills}
-    
+
     # If user has no skills, return empty list
     if not user_skill_ids:
         return []
-    
-    # Calculate match scores for each job
+
+    if backend == "index":
+        return _top_jobs_from_index(db, user_skill_ids, limit, filters, after)
+    elif backend == "memory":
+        return _top_jobs_in_memory(db, user_skill_ids, limit, filters, after)
+    elif backend == "database":
+        return _top_jobs_in_database(db, user, limit, filters, after)
+    else:
+        raise ValueError(f"Unknown recommendation backend: {backend}")
+
+def _top_jobs_from_index(
+    db: Session,
+    user_skill_ids: Set[int],
+    limit: int,
+    filters: Optional[RecommendationFilters],
+    after: Optional[Keyset]
+) -> List[Tuple[int, float]]:
+    """Score only the jobs sharing a skill with the user"""
+    index = get_skill_index(db)
+    return index.top_jobs(user_skill_ids, limit, filters, after)
+
+def _top_jobs_in_memory(
+    db: Session,
+    user_skill_ids: Set[int],
+    limit: int,
+    filters: Optional[RecommendationFilters],
+    after: Optional[Keyset]
+) -> List[Tuple[int, float]]:
+    """Score jobs with the in-memory sparse skill matrix"""
+    engine = get_recommendation_engine(db)
+    return engine.top_jobs(user_skill_ids, limit, filters, after)
+
+def _top_jobs_in_database(
+    db: Session,
+    user: User,
+    limit: int,
+    filters: Optional[RecommendationFilters],
+    after: Optional[Keyset]
+) -> List[Tuple[int, float]]:
+    """
+    Score jobs inside the database.
+
+    Each active job's skill links are left-joined against the user's skills,
+    so per job count(*) is the number of required skills and the count of
+    joined user rows is the number matched. Only the top `limit` job ids
+    and their counts come back.
+    """
+    if limit <= 0:
+        return []
+
+    matched = func.count(user_skill.c.user_id)
+    required = func.count()
+    score = match_score_expression(matched, required)
+
+    query = (
+        select(job_skill.c.job_id, matched, required)
+        .select_from(
+            job_skill
+            .join(Job, Job.id == job_skill.c.job_id)
+            .outerjoin(
+                user_skill,
+                and_(
+                    user_skill.c.skill_id == job_skill.c.skill_id,
+                    user_skill.c.user_id == user.id
+                )
+            )
+        )
+        .where(Job.is_active == True, *sql_conditions(filters))
+        .group_by(job_skill.c.job_id)
+        .having(matched > 0)
+        .order_by(score.desc(), job_skill.c.job_id)
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.having(sql_after(score, job_skill.c.job_id, after))
+
+    rows = db.execute(query).all()
+    return [(job_id, n_matched / n_required * 100) for job_id, n_matched, n_required in rows]
+
+def match_score_expression(matched, required):
+    """
+    SQL version of the match score for use in queries.
+
+    Same operation order as the Python scorer so floats compare identically.
+    """
+    return cast(matched, Float).op("/")(required) * 100
+
+def _top_jobs_precomputed(
+    db: Session,
+    user: User,
+    limit: int,
+    after: Optional[Keyset]
+) -> List[Tuple[int, float]]:
+    """Read the user's materialized top jobs in rank order"""
+    query = (
+        select(UserJobScore.job_id, UserJobScore.score)
+        .join(Job, Job.id == UserJobScore.job_id)
+        .where(UserJobScore.user_id == user.id, Job.is_active == True)
+        .order_by(UserJobScore.rank)
+        .limit(limit)
+    )
+    if after is not None:
+        query = query.where(sql_after(UserJobScore.score, UserJobScore.job_id, after))
+
+    return [(job_id, score) for job_id, score in db.execute(query)]
+
+def _load_job_matches(db: Session, top_jobs: List[Tuple[int, float]]) -> List[JobSchema]:
+    """Load the selected jobs and attach their match scores, keeping order"""
+    if not top_jobs:
+        return []
+
+    # Fetch only the selected jobs, with their skills in one extra query
+    jobs_by_id = load_job_dicts(db, [job_id for job_id, _ in top_jobs])
+
     job_matches = []
-    for job in all_jobs:
-        job_skill_ids = {skill.id for skill in job.required_skills}
-        
-        # If job has no required skills, skip it
-        if not job_skill_ids:
+    for job_id, match_score in top_jobs:
+        job = jobs_by_id.get(job_id)
+        if job is None:
             continue
-        
-        # Calculate match score
-        matching_skills = user_skill_ids.intersection(job_skill_ids)
-        match_score = len(matching_skills) / len(job_skill_ids) * 100
-        
-        # Only consider jobs with at least one matching skill
-        if match_score > 0:
-            # Convert to schema and add match score
-            job_schema = JobSchema.from_orm(job)
-            job_schema.match_score = match_score
-            job_matches.append(job_schema)
-    
-    # Sort by match score (highest first)
-    job_matches.sort(key=lambda x: x.match_score, reverse=True)
-    
-    # Return top N results
-    return job_matches[:limit]
\ No newline at end of file
+        # Validate from plain dicts rather than ORM attributes
+        job["match_score"] = match_score
+        job_matches.append(JobSchema.model_validate(job))
+
+    return job_matches
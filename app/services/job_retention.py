@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.application import Application
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.models.user_job_score import UserJobScore
+from app.services.job_dedup import duplicate_jobs_index
+from app.services.job_similarity import similar_jobs_index
+from app.services.recommendation_cache import recommendation_cache
+from app.services.skill_index import skill_index
+
+
+def retire_unseen_jobs(db: Session, max_age_hours: Optional[float] = None) -> List[int]:
+    """
+    Mark active jobs that no crawl has seen for `max_age_hours` as
+    inactive, in a single UPDATE, and drop them from the in-memory indexes.
+
+    Returns:
+    List[int]: Ids of the jobs retired
+    """
+    now = datetime.now()
+    cutoff = now - timedelta(hours=max_age_hours or settings.JOB_RETIRE_AFTER_HOURS)
+    try:
+        job_ids = list(db.execute(
+            update(Job)
+            .where(Job.is_active == True, Job.last_seen_at < cutoff)
+            .values(is_active=False, retired_at=now)
+            .returning(Job.id)
+        ).scalars())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if job_ids:
+        skill_index.remove_jobs(job_ids)
+        similar_jobs_index.remove_jobs(job_ids)
+        duplicate_jobs_index.remove_jobs(job_ids)
+        recommendation_cache.bump_catalog()
+    return job_ids
+
+
+def purge_retired_jobs(
+    db: Session,
+    retention_days: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> int:
+    """
+    Delete jobs retired more than `retention_days` ago, with their skill
+    links and precomputed scores.
+
+    Jobs are deleted `chunk_size` at a time, each chunk in its own short
+    transaction, so a large purge never holds locks for long. Jobs someone
+    applied to are kept, so application histories stay intact.
+
+    Returns:
+    int: Number of jobs deleted
+    """
+    cutoff = datetime.now() - timedelta(days=retention_days or settings.JOB_RETENTION_DAYS)
+    chunk_size = chunk_size or settings.JOB_PURGE_CHUNK_SIZE
+    deleted = 0
+    while True:
+        try:
+            job_ids = list(db.execute(
+                select(Job.id)
+                .where(
+                    Job.is_active == False,
+                    Job.retired_at < cutoff,
+                    ~exists().where(Application.job_id == Job.id)
+                )
+                .order_by(Job.id)
+                .limit(chunk_size)
+            ).scalars())
+            if not job_ids:
+                db.rollback()
+                return deleted
+            db.execute(delete(job_skill).where(job_skill.c.job_id.in_(job_ids)))
+            db.execute(delete(UserJobScore).where(UserJobScore.job_id.in_(job_ids)))
+            db.execute(delete(Job).where(Job.id.in_(job_ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        deleted += len(job_ids)
@@ -1,12 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-import time
-import random
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
+import httpx
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.job import Job
-from app.models.skill import Skill
+from app.services.html_parsing import get_html_parser
+from app.services.http_fetch import AsyncFetcher, FetchError, is_not_modified
+from app.services.job_fingerprint import job_source_key
+from app.services.job_persistence import load_jobs, touch_jobs, upsert_jobs
+from app.services.skill_matcher import get_skill_matcher
 
 
 class JobScraper:
@@ -20,103 +22,28 @@ class JobScraper:
     
     def extract_skills_from_description(self, description: str) -> List[str]:
         """
-        Extract skills from job description using a simple keyword approach.
+        Extract skills from job description using a keyword approach.
+        
+        Uses the shared SkillMatcher, which knows every skill in the skills
+        table plus common aliases and finds them all in one pass over the
+        text, on token boundaries only.
         In a production environment, this would be replaced with a more sophisticated NLP approach.
         """
-        # Common tech skills to look for (this is a simplified approach)
-        common_skills = [
-            "python", "javascript", "react", "node.js", "django", "flask", "sql", "postgresql",
-            "mongodb", "aws", "docker", "kubernetes", "html", "css", "typescript", "java",
-            "c++", "c#", "ruby", "php", "go", "swift", "kotlin", "rust", "scala", "r",
-            "machine learning", "data science", "ai", "artificial intelligence", "deep learning",
-            "devops", "ci/cd", "git", "agile", "scrum", "rest api", "graphql", "redux",
-            "angular", "vue.js", "express", "spring", "asp.net", "laravel", "rails"
-        ]
-        
-        description = description.lower()
-        found_skills = []
-        
-        for skill in common_skills:
-            if skill in description:
-                found_skills.append(skill)
-        
-        return found_skills
-    
-    def save_job_to_db(self, job_data: Dict[str, Any]) -> Job:
-        """Save job data to database"""
-         # Check for duplicate by URL or by title+company combination
-        existing_job = self.db.query(Job).filter(
-            (Job.url == job_data["url"]) |
-            ((Job.title == job_data["title"]) & (Job.company == job_data["company"]))
-        ).first()
+        return get_skill_matcher(self.db).find(description)
     
-        if existing_job:
-        # Update existing job
-            existing_job.description = job_data["description"]
-            existing_job.location = job_data["location"]
-            existing_job.salary_min = job_data.get("salary_min")
-            existing_job.salary_max = job_data.get("salary_max")
-            existing_job.job_type = job_data.get("job_type", "Full-time")
-            existing_job.remote = job_data.get("remote", False)
-            existing_job.updated_at = datetime.now()
-            existing_job.is_active = True  # Ensure it's marked as active
-            
-            # Update skills
-            # First, let's get the current skills
-            current_skill_ids = {skill.id for skill in existing_job.required_skills}
-            
-            # Extract new skills
-            skills_found = self.extract_skills_from_description(job_data["description"])
-            for skill_name in skills_found:
-                # Find or create skill
-                skill = self.db.query(Skill).filter(Skill.name == skill_name).first()
-                if not skill:
-                    skill = Skill(name=skill_name)
-                    self.db.add(skill)
-                    self.db.commit()
-                
-                # Add skill to job if not already there
-                if skill.id not in current_skill_ids:
-                    existing_job.required_skills.append(skill)
-            
-            self.db.commit()
-            self.db.refresh(existing_job)
-            return existing_job
+    def create_fetcher(self) -> AsyncFetcher:
+        """Pooled client for the scraper's requests, shared by all its searches"""
+        return AsyncFetcher(headers=self.headers)
     
-        # Create job instance
-        db_job = Job(
-            title=job_data["title"],
-            company=job_data["company"],
-            location=job_data["location"],
-            description=job_data["description"],
-            salary_min=job_data.get("salary_min"),
-            salary_max=job_data.get("salary_max"),
-            job_type=job_data.get("job_type", "Full-time"),
-            remote=job_data.get("remote", False),
-            url=job_data["url"],
-            source=job_data["source"],
-            posted_date=job_data.get("posted_date", datetime.now())
-        )
-        
-        # Extract and add skills
-        skills_found = self.extract_skills_from_description(job_data["description"])
-        for skill_name in skills_found:
-            # Find or create skill
-            skill = self.db.query(Skill).filter(Skill.name == skill_name).first()
-            if not skill:
-                skill = Skill(name=skill_name)
-                self.db.add(skill)
-                self.db.commit()
-            
-            # Add skill to job
-            db_job.required_skills.append(skill)
-        
-        # Save to database
-        self.db.add(db_job)
-        self.db.commit()
-        self.db.refresh(db_job)
+    def save_job_to_db(self, job_data: Dict[str, Any]) -> Job:
+        """
+        Save job data to database
         
-        return db_job
+        Goes through the bulk upsert pipeline, so an existing posting is
+        updated in place and an unchanged one is only marked as seen.
+        """
+        result = upsert_jobs(self.db, [job_data])
+        return self.db.get(Job, result.job_ids[0])
     
     def scrape_jobs(self) -> List[Job]:
         """
@@ -127,9 +54,9 @@ class JobScraper:
 class IndeedScraper(JobScraper):
     """Scraper for Indeed job listings"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, base_url: Optional[str] = None):
         super().__init__(db)
-        self.base_url = "https://www.indeed.com"
+        self.base_url = base_url or settings.INDEED_BASE_URL
     
     def scrape_jobs(self, keywords: str, location: str, limit: int = 20) -> List[Job]:
         """
@@ -150,74 +77,133 @@ class IndeedScraper(JobScraper):
         saved_jobs = []
         
         try:
-            response = requests.get(search_url, headers=self.headers)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                job_cards = soup.find_all('div', class_='jobsearch-SerpJobCard')
+            pages = asyncio.run(self._fetch_search(search_url, limit))
+            if pages is not None:
+                # Job pages the server reports unchanged only need marking as seen
+                unchanged = {
+                    job_source_key({"url": job_url}) for _, _, job_url, response in pages
+                    if is_not_modified(response)
+                }
+                seen = touch_jobs(self.db, unchanged)
                 
-                for job_card in job_cards[:limit]:
-                    title_element = job_card.find('h2', class_='title')
-                    if not title_element:
+                scraped = []
+                for title, company, job_url, response in pages:
+                    if response is None or response.status_code != 200:
                         continue
-                    
-                    title = title_element.get_text().strip()
-                    company_element = job_card.find('span', class_='company')
-                    company = company_element.get_text().strip() if company_element else "Unknown"
-                    
-                    # Get job URL
-                    job_url = self.base_url + title_element.find('a')['href']
-                    
-                    # Get job details
-                    job_details = self.get_job_details(job_url)
-                    if not job_details:
+                    if is_not_modified(response) and job_source_key({"url": job_url}) in seen:
                         continue
-                    
-                    # Combine all job data
-                    job_data = {
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "description": job_details["description"],
-                        "url": job_url,
-                        "source": "Indeed",
-                        "remote": "remote" in title.lower() or "remote" in job_details["description"].lower(),
-                        "job_type": "Full-time"  # Default, could be extracted from description
-                    }
-                    
-                    # Save to database
-                    saved_job = self.save_job_to_db(job_data)
-                    saved_jobs.append(saved_job)
-                    
-                    # Be nice to the server
-                    time.sleep(random.uniform(1, 3))
+                    scraped.extend(self.parse_page((title, company, job_url), response, location=location))
+                
+                # Save every new or changed job in one transaction
+                result = upsert_jobs(self.db, scraped)
+                print(f"Indeed: {result.inserted} new, {result.updated} updated, {result.unchanged + len(seen)} unchanged, {result.duplicates} duplicates")
+                saved_jobs = load_jobs(self.db, list(seen.values()) + result.job_ids)
         
         except Exception as e:
             print(f"Error scraping Indeed: {str(e)}")
         
         return saved_jobs
     
-    def get_job_details(self, job_url: str) -> Optional[Dict[str, str]]:
-        """Get detailed job information from job page"""
-        try:
-            response = requests.get(job_url, headers=self.headers)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract job description
-                description_div = soup.find('div', id='jobDescriptionText')
-                if not description_div:
-                    return None
-                
-                description = description_div.get_text().strip()
-                
-                return {
-                    "description": description
-                }
+    async def _fetch_search(self, search_url: str, limit: int) -> Optional[List[Tuple[str, str, str, Any]]]:
+        """
+        Fetch a search page and then all its job pages concurrently;
+        concurrency and per-host rate are bounded by the fetcher.
         
-        except Exception as e:
-            print(f"Error getting job details: {str(e)}")
+        Returns:
+        Optional[List[Tuple]]: (title, company, job URL, job page response)
+        per job card, or None if the search page could not be fetched
+        """
+        async with self.create_fetcher() as fetcher:
+            cards = await self._search_cards(fetcher, search_url, limit)
+            if cards is None:
+                return None
+            
+            # Get job details
+            responses = await fetcher.fetch_many([job_url for _, _, job_url in cards])
+        
+        return [card + (response,) for card, response in zip(cards, responses)]
+    
+    async def _search_cards(self, fetcher: AsyncFetcher, search_url: str, limit: int) -> Optional[List[Tuple[str, str, str]]]:
+        """(title, company, job URL) per job card, or None if the search page could not be fetched"""
+        response = await fetcher.fetch(search_url)
+        if response is None or response.status_code != 200:
+            return None
+        return [
+            (card.title, card.company or "Unknown", self.base_url + card.href)
+            for card in get_html_parser().search_cards(response.text, limit)
+        ]
+    
+    async def fetch_pages(
+        self,
+        fetcher: AsyncFetcher,
+        keywords: str,
+        location: str,
+        limit: int = 20
+    ) -> AsyncIterator[Tuple[Tuple[str, str, str], httpx.Response]]:
+        """
+        Fetch a search page, then yield its job pages as they arrive.
+        
+        Raises:
+        FetchError: If the search page, or every one of its job pages,
+        could not be fetched, so the crawl is not mistaken for one that
+        found nothing changed
+        """
+        search_url = f"{self.base_url}/jobs?q={keywords}&l={location}"
+        cards = await self._search_cards(fetcher, search_url, limit)
+        if cards is None:
+            raise FetchError(f"Indeed search page for {keywords} could not be fetched")
+        
+        async def fetch_card(card):
+            return card, await fetcher.fetch(card[2])
         
-        return None
+        fetched_pages = 0
+        for fetched in asyncio.as_completed([fetch_card(card) for card in cards]):
+            card, response = await fetched
+            if response is not None and response.status_code == 200:
+                fetched_pages += 1
+                yield card, response
+        if cards and not fetched_pages:
+            raise FetchError(f"None of the {len(cards)} Indeed job pages for {keywords} could be fetched")
+    
+    def page_source_keys(self, card: Tuple[str, str, str], response: httpx.Response, **terms) -> List[str]:
+        """Source key of the job on a job page, from its card alone"""
+        return [job_source_key({"url": card[2]})]
+    
+    def parse_page(
+        self,
+        card: Tuple[str, str, str],
+        response: httpx.Response,
+        location: str = "",
+        **terms
+    ) -> List[Dict[str, Any]]:
+        """The job on a job page, as the job data upsert_jobs expects"""
+        title, company, job_url = card
+        job_details = self.parse_job_details(response.text)
+        if not job_details:
+            return []
+        
+        # Combine all job data
+        return [{
+            "title": title,
+            "company": company,
+            "location": location,
+            "description": job_details["description"],
+            "url": job_url,
+            "source": "Indeed",
+            "remote": "remote" in title.lower() or "remote" in job_details["description"].lower(),
+            "job_type": "Full-time"  # Default, could be extracted from description
+        }]
+    
+    @staticmethod
+    def parse_job_details(html: str) -> Optional[Dict[str, str]]:
+        """Extract the job description from a job page"""
+        description = get_html_parser().job_description(html)
+        if not description:
+            return None
+        
+        return {
+            "description": description
+        }
 
 # You could implement more scrapers for other job sites (LinkedIn, Glassdoor, etc.)
 # class LinkedInScraper(JobScraper):
@@ -0,0 +1,55 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.models.skill import Skill, job_skill
+
+# Columns of the Job response schema, selected as plain rows
+JOB_COLUMNS = (
+    Job.id, Job.title, Job.company, Job.location, Job.description,
+    Job.salary_min, Job.salary_max, Job.job_type, Job.remote, Job.url,
+    Job.source, Job.posted_date, Job.is_active
+)
+
+
+def load_skills_by_job(db: Session, job_ids: Sequence[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Load the required skills of many jobs with a single IN query"""
+    skills_by_job: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    if not job_ids:
+        return skills_by_job
+
+    rows = db.execute(
+        select(job_skill.c.job_id, Skill.id, Skill.name, Skill.category)
+        .join(Skill, Skill.id == job_skill.c.skill_id)
+        .where(job_skill.c.job_id.in_(job_ids))
+        .order_by(job_skill.c.job_id, Skill.id)
+    )
+    for job_id, skill_id, name, category in rows:
+        skills_by_job[job_id].append({"id": skill_id, "name": name, "category": category})
+    return skills_by_job
+
+
+def serialize_job_rows(db: Session, rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Turn rows of JOB_COLUMNS into Job response dicts.
+
+    Works on plain column rows instead of ORM instances, so nothing is
+    lazy-loaded: a page costs one query for the jobs and one for all of
+    their skills, whatever its size.
+    """
+    jobs = [row._asdict() for row in rows]
+    skills_by_job = load_skills_by_job(db, [job["id"] for job in jobs])
+    for job in jobs:
+        job["required_skills"] = skills_by_job.get(job["id"], [])
+    return jobs
+
+
+def load_job_dicts(db: Session, job_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+    """Load Job response dicts for the given ids, keyed by id"""
+    if not job_ids:
+        return {}
+    rows = db.execute(select(*JOB_COLUMNS).where(Job.id.in_(job_ids)))
+    return {job["id"]: job for job in serialize_job_rows(db, rows)}
@@ -0,0 +1,117 @@
+import argparse
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.services.minhash import LSHIndex, MinHasher, pack_signature, unpack_signature
+
+# Fixed seed: persisted signatures must stay comparable across restarts
+skill_hasher = MinHasher(num_perm=64, seed=20250416)
+
+
+def skill_signature(skill_ids: Iterable[int]) -> Optional[bytes]:
+    """Packed MinHash signature of a job's required skill ids"""
+    return pack_signature(skill_hasher.signature(skill_ids))
+
+
+def set_skill_signature(job: Job) -> None:
+    """Compute and store the skill signature of a job before it is committed"""
+    job.skill_minhash = skill_signature(skill.id for skill in job.required_skills)
+
+
+class SimilarJobsIndex:
+    """
+    LSH index over the persisted skill signatures of active jobs.
+
+    Loading only reads the `skill_minhash` column; signatures are computed
+    when jobs are saved, so a restart never recomputes them. Rows saved
+    before the column existed are backfilled once by running this module.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.lsh = LSHIndex(bands=16, rows=4)
+        self.is_loaded = False
+
+    def refresh(self, db: Session) -> None:
+        with self._lock:
+            self.lsh.clear()
+            rows = db.execute(
+                select(Job.id, Job.skill_minhash)
+                .where(Job.is_active == True, Job.skill_minhash.isnot(None))
+            )
+            for job_id, data in rows:
+                self.lsh.add(job_id, unpack_signature(data))
+            self.is_loaded = True
+
+    def add_job(self, job: Job) -> None:
+        if not self.is_loaded:
+            return
+        signature = unpack_signature(job.skill_minhash)
+        if job.is_active and signature is not None:
+            self.lsh.add(job.id, signature)
+        else:
+            self.lsh.remove(job.id)
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> None:
+        if not self.is_loaded:
+            return
+        for job_id in job_ids:
+            self.lsh.remove(job_id)
+
+    def similar(self, job: Job, limit: int = 10) -> List[Tuple[int, float]]:
+        signature = unpack_signature(job.skill_minhash)
+        if signature is None:
+            return []
+        return self.lsh.query(signature, limit, exclude=job.id)
+
+
+similar_jobs_index = SimilarJobsIndex()
+
+
+def get_similar_jobs_index(db: Optional[Session] = None) -> SimilarJobsIndex:
+    """Return the shared index, loading it from the database on first use"""
+    if not similar_jobs_index.is_loaded and db is not None:
+        similar_jobs_index.refresh(db)
+    return similar_jobs_index
+
+
+def backfill_skill_signatures(db: Session, batch_size: int = 1000) -> int:
+    """Compute signatures for jobs saved before they were persisted"""
+    updated = 0
+    while True:
+        job_ids = db.execute(
+            select(Job.id)
+            .where(Job.skill_minhash.is_(None))
+            .where(Job.id.in_(select(job_skill.c.job_id)))
+            .limit(batch_size)
+        ).scalars().all()
+        if not job_ids:
+            break
+        for job in db.query(Job).filter(Job.id.in_(job_ids)).all():
+            set_skill_signature(job)
+        db.commit()
+        updated += len(job_ids)
+    return updated
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compute the skill signatures of jobs saved without one")
+    parser.add_argument("--batch-size", type=int, default=1000, help="jobs updated per transaction")
+    args = parser.parse_args(argv)
+
+    from app.db.database import SessionLocal
+
+    with SessionLocal() as db:
+        updated = backfill_skill_signatures(db, args.batch_size)
+    print(f"Backfilled {updated} job skill signatures")
+
+
+# Run with: python -m app.services.job_similarity
+# (once, after migrating to c4f2a81d9e57)
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
 # app/services/job_sync.py
 from sqlalchemy.orm import Session
-from typing import List
-import schedule
-import time
-import threading
+from typing import List, Optional
 from app.services.job_scrapers import IndeedScraper
 from app.services.job_collectors import AdzunaJobCollector
 from app.core.config import settings
-from app.models.job import Job
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_engine import recommendation_engine
+from app.services.score_store import rebuild_all_scores
+from app.services.crawl_scheduler import crawl_scheduler
+from app.services.job_retention import purge_retired_jobs, retire_unseen_jobs
+from app.services.sync_pipeline import SyncPipeline, SyncPipelineResult, SyncTask
+
+# Example search terms
+SCRAPER_SEARCH_TERMS = [
+    {"keywords": "python developer", "location": "remote"},
+    {"keywords": "react developer", "location": "remote"},
+    {"keywords": "full stack developer", "location": "remote"}
+]
+COLLECTOR_SEARCH_TERMS = [
+    {"keywords": "python developer"},
+    {"keywords": "react developer"},
+    {"keywords": "full stack developer"}
+]
 
 class JobSyncService:
     """Service to sync jobs from various sources"""
@@ -19,117 +33,116 @@ class JobSyncService:
         ]
         
         # Initialize API collectors if API keys are available
-        adzuna_app_id = getattr(settings, "ADZUNA_APP_ID", None)
-        adzuna_api_key = getattr(settings, "ADZUNA_API_KEY", None)
-        
         self.collectors = []
-        if adzuna_app_id and adzuna_api_key:
+        if settings.ADZUNA_APP_ID and settings.ADZUNA_API_KEY:
             self.collectors.append(
-                AdzunaJobCollector(db, adzuna_app_id, adzuna_api_key)
+                AdzunaJobCollector(db, settings.ADZUNA_APP_ID, settings.ADZUNA_API_KEY)
             )
     
-    def sync_jobs(self):
-        """Sync jobs from all sources"""
+    def tasks(self) -> List[SyncTask]:
+        """Every search of every source"""
+        tasks = [SyncTask(scraper, terms) for scraper in self.scrapers for terms in SCRAPER_SEARCH_TERMS]
+        tasks += [SyncTask(collector, terms) for collector in self.collectors for terms in COLLECTOR_SEARCH_TERMS]
+        return tasks
+    
+    def due_tasks(self) -> List[SyncTask]:
+        """The searches the adaptive crawl schedule says are due"""
+        tasks = crawl_scheduler.due_tasks(self.db, self.tasks())
+        # Don't hold a read transaction open until the crawl starts writing
+        self.db.rollback()
+        return tasks
+    
+    def sync_jobs(self, tasks: Optional[List[SyncTask]] = None) -> Optional[SyncPipelineResult]:
+        """
+        Sync jobs from all sources
+        
+        Parameters:
+        tasks (List[SyncTask]): Searches to crawl (default: all of them)
+        
+        Returns:
+        Optional[SyncPipelineResult]: What the crawl fetched and changed, or
+        None if it failed
+        """
         print("Starting job sync...")
         
-        current_job_ids = set()
+        # Fetch, parse, skill extraction and saving run as overlapping
+        # stages over every source and search term at once
+        tasks = self.tasks() if tasks is None else tasks
+        result = None
+        try:
+            result = SyncPipeline(self.db).run(tasks)
+            for task in result.tasks:
+                source, terms = task.task
+                print(f"{type(source).__name__}: {len(task.job_ids)} jobs for {terms['keywords']} ({task.inserted} new, {task.updated} updated)")
+            print(result.report())
+        except Exception as e:
+            print(f"Error running sync pipeline: {str(e)}")
         
-        # Use scrapers
-        for scraper in self.scrapers:
+        # Adapt each search's crawl interval to how much it just changed
+        if result is not None:
             try:
-                # Example search terms
-                search_terms = [
-                    {"keywords": "python developer", "location": "remote"},
-                    {"keywords": "react developer", "location": "remote"},
-                    {"keywords": "full stack developer", "location": "remote"}
-                ]
-                
-                for terms in search_terms:
-                    jobs = scraper.scrape_jobs(**terms)
-                    print(f"Scraped {len(jobs)} jobs for {terms['keywords']}")
-                    # Add job IDs to current set
-                    current_job_ids.update([job.id for job in jobs])
-            
+                crawl_scheduler.record(self.db, result.tasks)
             except Exception as e:
-                print(f"Error with scraper {type(scraper).__name__}: {str(e)}")
+                self.db.rollback()
+                print(f"Error updating crawl schedule: {str(e)}")
         
-        # Use API collectors
-        for collector in self.collectors:
-            try:
-                search_terms = [
-                    {"keywords": "python developer"},
-                    {"keywords": "react developer"},
-                    {"keywords": "full stack developer"}
-                ]
-                
-                for terms in search_terms:
-                    jobs = collector.collect_jobs(**terms)
-                    print(f"Collected {len(jobs)} jobs for {terms['keywords']}")
-                    # Add job IDs to current set
-                    current_job_ids.update([job.id for job in jobs])
+        try:
+            # Mark jobs no crawl has seen for JOB_RETIRE_AFTER_HOURS as
+            # inactive, but not after a failed crawl that could not see them
+            if result is not None:
+                retired = retire_unseen_jobs(self.db)
+                result = result._replace(retired=len(retired))
+                print(f"Marked {len(retired)} old jobs as inactive")
             
-            except Exception as e:
-                print(f"Error with collector {type(collector).__name__}: {str(e)}")
-         # Mark jobs not found in this sync as inactive
-        self._mark_old_jobs_inactive(current_job_ids)
+            # Remove jobs retired longer than the retention period
+            deleted = purge_retired_jobs(self.db)
+            print(f"Removed {deleted} old inactive jobs from the database")
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error retiring old jobs: {str(e)}")
         
-        # Remove very old inactive jobs
-        self._remove_old_inactive_jobs(days=30)  # Keep inactive jobs for 30 days
+        # Recommendations only depend on the active jobs, so a crawl that
+        # found nothing new leaves them as they are. A failed crawl may
+        # still have saved some batches.
+        if result is not None and not result.changed:
+            print("No jobs changed, keeping recommendations")
+        else:
+            self.refresh_recommendations()
         
         print("Job sync completed")
-        
-    def _mark_old_jobs_inactive(self, current_job_ids):
-        """Mark jobs not found in the current sync as inactive"""
-        if not current_job_ids:
-            return
-            
-        old_jobs = self.db.query(Job).filter(
-            Job.is_active == True,
-            ~Job.id.in_(current_job_ids)
-        ).all()
-        
-        for job in old_jobs:
-            job.is_active = False
-        
-        self.db.commit()
-        print(f"Marked {len(old_jobs)} old jobs as inactive")
+        return result
     
-    def _remove_old_inactive_jobs(self, days=30):
-        """Remove inactive jobs older than the specified number of days"""
-        from datetime import datetime, timedelta
-        cutoff_date = datetime.now() - timedelta(days=days)
+    def refresh_recommendations(self) -> None:
+        """Bring every recommendation backend up to date with the active jobs"""
+        # Rebuild the in-memory recommendation matrix from the new job set,
+        # if this process has built it at all
+        try:
+            if recommendation_engine.is_loaded:
+                recommendation_engine.refresh(self.db)
+        except Exception as e:
+            print(f"Error refreshing recommendation engine: {str(e)}")
         
-        deleted = self.db.query(Job).filter(
-            Job.is_active == False,
-            Job.updated_at < cutoff_date
-        ).delete(synchronize_session=False)
-        
-        self.db.commit()
-        print(f"Removed {deleted} old inactive jobs from the database")
-    
-    async def schedule_sync(self, interval_hours=12):
-        """Schedule periodic job sync"""
-        schedule.every(interval_hours).hours.do(self.sync_jobs)
+        # Rebuild the materialized per-user top jobs, which only the
+        # precomputed backend reads
+        if settings.RECOMMENDATION_BACKEND == "precomputed":
+            try:
+                rows = rebuild_all_scores(self.db)
+                print(f"Precomputed {rows} user job scores")
+            except Exception as e:
+                self.db.rollback()
+                print(f"Error precomputing user job scores: {str(e)}")
         
-        # Run in background thread
-        def run_scheduler():
-            while True:
-                schedule.run_pending()
-                time.sleep(60)
+        # Never serve recommendations computed against the previous catalog
+        recommendation_cache.bump_catalog()
         
-        thread = threading.Thread(target=run_scheduler, daemon=True)
-        thread.start()
+    async def schedule_sync(self, check_minutes=None):
+        """
+        Schedule periodic job sync
         
-        return thread
-
-# To use in main.py:
-# from app.db.base import SessionLocal
-# from app.services.job_sync import JobSyncService
-# 
-# # Start job sync on application startup
-# @app.on_event("startup")
-# def start_job_sync():
-#     db = SessionLocal()
-#     job_sync = JobSyncService(db)
-#     job_sync.schedule_sync(interval_hours=12)
-
+        Searches are crawled when the adaptive crawl schedule says they are
+        due, which is checked every `check_minutes`. Each run takes the
+        cluster-wide sync lock and its own sessions, so any number of API
+        processes may schedule it; see app.services.sync_worker.
+        """
+        from app.services.sync_worker import start_sync_scheduler
+        return start_sync_scheduler(check_minutes)
@@ -0,0 +1,127 @@
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class MinHasher:
+    """
+    MinHash signatures over sets of integer or string tokens.
+
+    Each of the `num_perm` hash functions is a multiply-shift hash on 64-bit
+    integers, so a whole token set is hashed with a few vectorized numpy
+    operations. The fraction of equal signature positions between two sets
+    estimates their Jaccard similarity.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Odd multipliers keep the multiply-shift family universal
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: Iterable[Hashable]) -> Optional[np.ndarray]:
+        """Signature of a token set, or None for an empty set"""
+        values = {self._token_value(token) for token in tokens}
+        if not values:
+            return None
+        x = np.fromiter(values, dtype=np.uint64, count=len(values))
+        with np.errstate(over="ignore"):
+            hashed = (self._a[:, None] * x[None, :] + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def _token_value(token: Hashable) -> int:
+        if isinstance(token, int):
+            return token & 0xFFFFFFFFFFFFFFFF
+        return zlib.crc32(str(token).encode())
+
+
+def pack_signature(signature: Optional[np.ndarray]) -> Optional[bytes]:
+    """Serialize a signature for storage in a LargeBinary column"""
+    if signature is None:
+        return None
+    return signature.astype("<u4").tobytes()
+
+
+def unpack_signature(data: Optional[bytes]) -> Optional[np.ndarray]:
+    if not data:
+        return None
+    return np.frombuffer(data, dtype="<u4")
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures.
+
+    A signature is cut into `bands` bands of `rows` values; two items become
+    candidates when any band matches exactly. With 16 bands of 4 rows, pairs
+    above roughly 0.5 Jaccard similarity are very likely to collide while
+    dissimilar pairs rarely do, so a lookup only touches a few buckets
+    instead of every item.
+    """
+
+    def __init__(self, bands: int = 16, rows: int = 4):
+        self.bands = bands
+        self.rows = rows
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = defaultdict(set)
+        self.signatures: Dict[int, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: int, signature: np.ndarray) -> None:
+        with self._lock:
+            self._remove(key)
+            self.signatures[key] = signature
+            for band_key in self._band_keys(signature):
+                self._buckets[band_key].add(key)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets = defaultdict(set)
+            self.signatures = {}
+
+    def query(self, signature: np.ndarray, limit: Optional[int] = 10, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Best `limit` items (all of them if None) sharing at least one band
+        with `signature`.
+
+        Returns:
+        List[Tuple[int, float]]: (key, estimated Jaccard) pairs, most similar
+        first, ties broken by key
+        """
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+            candidates.discard(exclude)
+            scored = [(key, estimate_jaccard(signature, self.signatures[key])) for key in candidates]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def _remove(self, key: int) -> None:
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
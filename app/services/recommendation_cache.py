@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from app.core.config import settings
+
+
+class RecommendationCache:
+    """
+    LRU cache of recommendation results.
+
+    Entries are keyed by (user id, user's skill ids, job-catalog
+    generation, request parameters). The skill ids are read from the
+    database on every request, so a skill added through any worker changes
+    the key everywhere; a sync or job save bumps the catalog generation.
+    Either way a stale entry can never be looked up again. Entries are
+    evicted least recently used first once either the entry count or the
+    approximate memory cap is hit.
+
+    The catalog generation is process-local, like the recommendation
+    indexes it fronts.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.catalog_generation = 0
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, user_id: int, skill_ids: Iterable[int], *params: Hashable) -> tuple:
+        """Build the cache key for a user's request at their current skills and catalog"""
+        with self._lock:
+            return (user_id, frozenset(skill_ids), self.catalog_generation) + params
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        with self._lock:
+            # Entries computed against an outdated catalog are dead on arrival
+            if key[2] != self.catalog_generation:
+                return
+            if key in self._entries:
+                self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.size_bytes += size
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def bump_catalog(self) -> None:
+        """Invalidate every entry after the set of active jobs changed"""
+        with self._lock:
+            self.catalog_generation += 1
+            # No key from an older generation can be looked up again
+            self._entries.clear()
+            self._sizes.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "catalog_generation": self.catalog_generation,
+            }
+
+    def _discard(self, key: Hashable) -> None:
+        del self._entries[key]
+        self.size_bytes -= self._sizes.pop(key)
+
+
+def estimate_jobs_size(jobs: List[Any]) -> int:
+    """Rough memory footprint of a list of serialized jobs, in bytes"""
+    size = 64
+    for job in jobs:
+        size += 512 + len(job.description or "") + len(job.title or "")
+        size += 96 * len(job.required_skills)
+    return size
+
+
+recommendation_cache = RecommendationCache(
+    max_entries=settings.RECOMMENDATION_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RECOMMENDATION_CACHE_MAX_BYTES
+)
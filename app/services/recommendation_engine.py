@@ -0,0 +1,209 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.schemas.job import RecommendationFilters
+from app.services.recommendation_filters import FACET_COLUMNS, JobFacets, Keyset, is_empty, make_facets, salary_bounds
+
+
+class RecommendationEngine:
+    """
+    In-memory job recommendation engine.
+
+    The active part of the `job_skill` association is held as a sparse CSR
+    job x skill matrix (`indptr`/`indices`, implicit values of 1) together with
+    a per-job required-skill count vector. Scoring a user is a single sparse
+    mat-vec against the user's skill indicator vector followed by a top-k
+    partial sort, instead of a Python loop over every active job.
+
+    Filterable job attributes are kept column-wise next to the matrix
+    (string attributes as codes into a small vocabulary) so recommendation
+    filters become a vectorized mask applied before the top-k selection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.skill_counts = np.zeros(0, dtype=np.int64)
+        self.n_skills = 0
+        self._set_facets(0, [])
+        self.is_loaded = False
+
+    def __getstate__(self):
+        # Sent to batch worker processes; locks cannot be pickled
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> None:
+        """Rebuild the matrix from the active jobs in the database"""
+        rows = db.execute(
+            select(job_skill.c.job_id, job_skill.c.skill_id)
+            .join(Job, Job.id == job_skill.c.job_id)
+            .where(Job.is_active == True)
+            .order_by(job_skill.c.job_id, job_skill.c.skill_id)
+        ).all()
+        facets = {
+            job_id: make_facets(*columns)
+            for job_id, *columns in db.execute(
+                select(Job.id, *FACET_COLUMNS).where(Job.is_active == True)
+            )
+        }
+        self.load(rows, facets)
+
+    def load(self, pairs: Iterable[Tuple[int, int]], facets: Optional[Dict[int, JobFacets]] = None) -> None:
+        """
+        Build the matrix from (job_id, skill_id) pairs sorted by job_id.
+
+        Jobs without any required skill never match, so they are simply not
+        represented in the matrix. Jobs without `facets` never pass a filter.
+        """
+        pairs = np.asarray(list(pairs), dtype=np.int64).reshape(-1, 2)
+        job_col, skill_col = pairs[:, 0], pairs[:, 1]
+
+        # Row boundaries are where the job id changes
+        if len(job_col):
+            starts = np.flatnonzero(np.r_[True, job_col[1:] != job_col[:-1]])
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+        job_ids = job_col[starts]
+        indptr = np.r_[starts, len(job_col)].astype(np.int64)
+        n_skills = int(skill_col.max()) + 1 if len(skill_col) else 0
+        facets = facets or {}
+
+        with self._lock:
+            self.job_ids = job_ids
+            self.indptr = indptr
+            self.indices = skill_col.copy()
+            self.skill_counts = np.diff(indptr)
+            self.n_skills = n_skills
+            self._set_facets(len(job_ids), [facets.get(int(job_id)) for job_id in job_ids])
+            self.is_loaded = True
+
+    def _set_facets(self, n_jobs: int, facets: Sequence[Optional[JobFacets]]) -> None:
+        self.has_facets = np.array([f is not None for f in facets], dtype=bool).reshape(n_jobs)
+        self.remote = np.array([bool(f and f.remote) for f in facets], dtype=bool).reshape(n_jobs)
+
+        bounds = [salary_bounds(f.salary_min, f.salary_max) if f else (None, None) for f in facets]
+        self.salary_low = np.array([np.nan if low is None else low for low, _ in bounds], dtype=float).reshape(n_jobs)
+        self.salary_high = np.array([np.nan if high is None else high for _, high in bounds], dtype=float).reshape(n_jobs)
+
+        # String attributes as codes into a vocabulary; -1 when unknown
+        self.vocabularies: Dict[str, List[str]] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        for name in ("location", "job_type", "source"):
+            vocabulary: Dict[str, int] = {}
+            codes = [vocabulary.setdefault(getattr(f, name), len(vocabulary)) if f else -1 for f in facets]
+            self.vocabularies[name] = list(vocabulary)
+            self.codes[name] = np.array(codes, dtype=np.int64).reshape(n_jobs)
+
+    def _filter_mask(self, filters: RecommendationFilters) -> np.ndarray:
+        """Boolean mask of the jobs passing `filters` (see facets_match)"""
+        mask = self.has_facets.copy()
+        if filters.remote is not None:
+            mask &= self.remote == filters.remote
+        if filters.location:
+            needle = filters.location.lower()
+            wanted = [code for code, value in enumerate(self.vocabularies["location"]) if needle in value]
+            mask &= np.isin(self.codes["location"], wanted)
+        for name in ("job_type", "source"):
+            value = getattr(filters, name)
+            if value:
+                vocabulary = self.vocabularies[name]
+                code = vocabulary.index(value.lower()) if value.lower() in vocabulary else -2
+                mask &= self.codes[name] == code
+        if filters.salary_min is not None or filters.salary_max is not None:
+            mask &= ~np.isnan(self.salary_low)
+            if filters.salary_min is not None:
+                mask &= self.salary_high >= filters.salary_min
+            if filters.salary_max is not None:
+                mask &= self.salary_low <= filters.salary_max
+        return mask
+
+    def top_jobs(
+        self,
+        user_skill_ids: Iterable[int],
+        limit: int = 10,
+        filters: Optional[RecommendationFilters] = None,
+        after: Optional[Keyset] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Score every job against a user's skills and return the best `limit`.
+
+        Scores follow the original recommender: the percentage of a job's
+        required skills the user has, skipping jobs with no match. Ties are
+        broken by ascending job id. Jobs not matching `filters`, or ranked at
+        or before the `after` keyset position, are dropped before selection.
+
+        Returns:
+        List[Tuple[int, float]]: (job_id, match_score) pairs, best first
+        """
+        with self._lock:
+            job_ids, indptr, indices = self.job_ids, self.indptr, self.indices
+            skill_counts, n_skills = self.skill_counts, self.n_skills
+            mask = None if is_empty(filters) else self._filter_mask(filters)
+
+        if limit <= 0 or not len(job_ids):
+            return []
+
+        # Skill indicator vector; skills unknown to the matrix cannot match
+        user_vector = np.zeros(n_skills, dtype=np.int64)
+        skill_ids = [skill_id for skill_id in user_skill_ids if 0 <= skill_id < n_skills]
+        if not skill_ids:
+            return []
+        user_vector[skill_ids] = 1
+
+        # Sparse mat-vec: matched[j] = sum(user_vector[indices[indptr[j]:indptr[j + 1]]])
+        hits = np.r_[0, np.cumsum(user_vector[indices])]
+        matched = hits[indptr[1:]] - hits[indptr[:-1]]
+        if mask is not None:
+            matched[~mask] = 0
+
+        candidates = np.flatnonzero(matched)
+        if not len(candidates):
+            return []
+        scores = matched[candidates] / skill_counts[candidates] * 100
+        candidate_ids = job_ids[candidates]
+
+        if after is not None:
+            after_score, after_job_id = after
+            keep = (scores < after_score) | ((scores == after_score) & (candidate_ids > after_job_id))
+            candidate_ids, scores = candidate_ids[keep], scores[keep]
+            if not len(scores):
+                return []
+
+        return self._select_top(candidate_ids, scores, limit)
+
+    @staticmethod
+    def _select_top(job_ids: np.ndarray, scores: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+        """Partial sort of (job_id, score) pairs by score desc, job id asc"""
+        if len(scores) > limit:
+            # Keep everything tied with the k-th best score so the
+            # tie-break on job id stays exact
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            keep = scores >= threshold
+            job_ids, scores = job_ids[keep], scores[keep]
+
+        order = np.lexsort((job_ids, -scores))[:limit]
+        return [(int(job_ids[i]), float(scores[i])) for i in order]
+
+
+recommendation_engine = RecommendationEngine()
+
+
+def get_recommendation_engine(db: Optional[Session] = None) -> RecommendationEngine:
+    """Return the shared engine, loading it from the database on first use"""
+    if not recommendation_engine.is_loaded and db is not None:
+        recommendation_engine.refresh(db)
+    return recommendation_engine
@@ -0,0 +1,124 @@
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+
+from app.models.job import Job
+from app.schemas.job import RecommendationFilters
+
+# (match_score, job_id) of the last recommendation already returned
+Keyset = Tuple[float, int]
+
+
+class JobFacets(NamedTuple):
+    """Filterable attributes of a job, normalized for matching"""
+    remote: bool
+    location: str
+    job_type: str
+    source: str
+    salary_min: Optional[float]
+    salary_max: Optional[float]
+
+
+# Columns to select when building facets in bulk
+FACET_COLUMNS = (Job.remote, Job.location, Job.job_type, Job.source, Job.salary_min, Job.salary_max)
+
+
+def make_facets(remote, location, job_type, source, salary_min, salary_max) -> JobFacets:
+    return JobFacets(
+        bool(remote),
+        (location or "").lower(),
+        (job_type or "").lower(),
+        (source or "").lower(),
+        salary_min,
+        salary_max
+    )
+
+
+def facets_from_job(job: Job) -> JobFacets:
+    return make_facets(job.remote, job.location, job.job_type, job.source, job.salary_min, job.salary_max)
+
+
+def is_empty(filters: Optional[RecommendationFilters]) -> bool:
+    return filters is None or not filters.model_dump(exclude_none=True)
+
+
+def filters_key(filters: Optional[RecommendationFilters]) -> tuple:
+    """Hashable form of the filters for cache keys"""
+    if filters is None:
+        return ()
+    return tuple(sorted(filters.model_dump(exclude_none=True).items()))
+
+
+def salary_bounds(salary_min: Optional[float], salary_max: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+    """A job's salary range, with a single known bound used for both ends"""
+    low = salary_min if salary_min is not None else salary_max
+    high = salary_max if salary_max is not None else salary_min
+    return low, high
+
+
+def facets_match(filters: Optional[RecommendationFilters], facets: Optional[JobFacets]) -> bool:
+    """
+    Python version of the recommendation filters.
+
+    location matches as a case-insensitive substring, job_type and source
+    case-insensitively in full. The salary filters keep jobs whose advertised
+    range overlaps the requested one, so jobs without a salary are dropped
+    as soon as a salary filter is set.
+    """
+    if is_empty(filters):
+        return True
+    if facets is None:
+        return False
+    if filters.remote is not None and facets.remote != filters.remote:
+        return False
+    if filters.location and filters.location.lower() not in facets.location:
+        return False
+    if filters.job_type and filters.job_type.lower() != facets.job_type:
+        return False
+    if filters.source and filters.source.lower() != facets.source:
+        return False
+    if filters.salary_min is not None or filters.salary_max is not None:
+        low, high = salary_bounds(facets.salary_min, facets.salary_max)
+        if low is None:
+            return False
+        if filters.salary_min is not None and high < filters.salary_min:
+            return False
+        if filters.salary_max is not None and low > filters.salary_max:
+            return False
+    return True
+
+
+def sql_conditions(filters: Optional[RecommendationFilters]) -> list:
+    """SQL version of facets_match, as a list of WHERE conditions on Job"""
+    if is_empty(filters):
+        return []
+    conditions = []
+    if filters.remote is not None:
+        conditions.append(Job.remote == filters.remote)
+    if filters.location:
+        conditions.append(func.lower(Job.location).contains(filters.location.lower(), autoescape=True))
+    if filters.job_type:
+        conditions.append(func.lower(Job.job_type) == filters.job_type.lower())
+    if filters.source:
+        conditions.append(func.lower(Job.source) == filters.source.lower())
+    if filters.salary_min is not None:
+        conditions.append(func.coalesce(Job.salary_max, Job.salary_min) >= filters.salary_min)
+    if filters.salary_max is not None:
+        conditions.append(func.coalesce(Job.salary_min, Job.salary_max) <= filters.salary_max)
+    return conditions
+
+
+def is_after(score: float, job_id: int, after: Optional[Keyset]) -> bool:
+    """Whether (score, job_id) ranks after the keyset position"""
+    if after is None:
+        return True
+    after_score, after_job_id = after
+    return score < after_score or (score == after_score and job_id > after_job_id)
+
+
+def sql_after(score, job_id, after: Optional[Keyset]):
+    """SQL version of is_after, or None when there is no keyset position"""
+    if after is None:
+        return None
+    after_score, after_job_id = after
+    return or_(score < after_score, and_(score == after_score, job_id > after_job_id))
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.models.user import user_skill
+from app.models.user_job_score import UserJobScore
+from app.services.job_recommendations import match_score_expression
+
+
+def _ranked_scores(top_n: int, user_id: Optional[int] = None):
+    """
+    Build a SELECT of (user_id, job_id, score, rank) holding each user's top
+    `top_n` active jobs, ranked by score desc and then job id like the
+    live recommender.
+    """
+    required = (
+        select(job_skill.c.job_id, func.count().label("required"))
+        .join(Job, Job.id == job_skill.c.job_id)
+        .where(Job.is_active == True)
+        .group_by(job_skill.c.job_id)
+        .subquery()
+    )
+
+    matched_query = (
+        select(
+            user_skill.c.user_id,
+            job_skill.c.job_id,
+            func.count().label("matched")
+        )
+        .join(job_skill, job_skill.c.skill_id == user_skill.c.skill_id)
+        .group_by(user_skill.c.user_id, job_skill.c.job_id)
+    )
+    if user_id is not None:
+        matched_query = matched_query.where(user_skill.c.user_id == user_id)
+    matched = matched_query.subquery()
+
+    score = match_score_expression(matched.c.matched, required.c.required)
+    scored = (
+        select(
+            matched.c.user_id,
+            matched.c.job_id,
+            score.label("score"),
+            func.row_number().over(
+                partition_by=matched.c.user_id,
+                order_by=(score.desc(), matched.c.job_id)
+            ).label("rank")
+        )
+        .join(required, required.c.job_id == matched.c.job_id)
+        .subquery()
+    )
+
+    return (
+        select(scored.c.user_id, scored.c.job_id, scored.c.score, scored.c.rank)
+        .where(scored.c.rank <= top_n)
+    )
+
+
+def _replace_scores(db: Session, top_n: int, user_id: Optional[int] = None) -> int:
+    computed_at = datetime.now()
+    ranked = _ranked_scores(top_n, user_id).add_columns(literal(computed_at, DateTime))
+
+    clear = delete(UserJobScore)
+    if user_id is not None:
+        clear = clear.where(UserJobScore.user_id == user_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(UserJobScore).from_select(
+            ["user_id", "job_id", "score", "rank", "computed_at"], ranked
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def rebuild_all_scores(db: Session, top_n: Optional[int] = None) -> int:
+    """
+    Rebuild the user_job_scores table for every user in one transaction.
+
+    The scoring runs entirely in the database as a single INSERT ... SELECT,
+    so nothing is pulled into Python.
+
+    Returns:
+    int: Number of rows written
+    """
+    if top_n is None:
+        top_n = settings.RECOMMENDATION_PRECOMPUTE_TOP_N
+    return _replace_scores(db, top_n)
+
+
+def rebuild_user_scores(db: Session, user_id: int, top_n: Optional[int] = None) -> int:
+    """Rebuild the precomputed scores of a single user after a skill change"""
+    if top_n is None:
+        top_n = settings.RECOMMENDATION_PRECOMPUTE_TOP_N
+    return _replace_scores(db, top_n, user_id)
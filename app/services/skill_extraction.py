@@ -0,0 +1,135 @@
+import argparse
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.services.job_similarity import skill_signature
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+from app.services.skill_resolver import skill_resolver
+
+# Below this many descriptions the pool start-up costs more than it saves
+MIN_DESCRIPTIONS_FOR_POOL = 500
+
+_worker_matcher: Optional[SkillMatcher] = None
+
+
+def _init_worker(matcher: SkillMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _extract_chunk(descriptions: List[str], matcher: Optional[SkillMatcher] = None) -> List[List[str]]:
+    matcher = matcher or _worker_matcher
+    return [matcher.find(description or "") for description in descriptions]
+
+
+def extract_skills_batch(
+    descriptions: Sequence[str],
+    matcher: Optional[SkillMatcher] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 200
+) -> List[List[str]]:
+    """
+    Extract the skills of many job descriptions, in the order given.
+
+    Large batches are split into chunks matched across a process pool; each
+    worker receives the compiled matcher once at start-up. Small batches are
+    matched in-process.
+    """
+    matcher = matcher or get_skill_matcher()
+    workers = workers or os.cpu_count() or 1
+    descriptions = list(descriptions)
+
+    if workers == 1 or len(descriptions) < MIN_DESCRIPTIONS_FOR_POOL:
+        return _extract_chunk(descriptions, matcher)
+
+    chunks = [descriptions[i:i + chunk_size] for i in range(0, len(descriptions), chunk_size)]
+    results: List[List[str]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,)) as pool:
+        for chunk_skills in pool.map(_extract_chunk, chunks):
+            results.extend(chunk_skills)
+    return results
+
+
+def reextract_job_skills(
+    db: Session,
+    active_only: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = 200
+) -> int:
+    """
+    Re-run skill extraction over stored job descriptions, e.g. after the
+    skill catalog or alias list changed.
+
+    Descriptions are read in one query and matched in parallel; only jobs
+    whose skill set changed get their job_skill rows and skill signature
+    rewritten, in one transaction. The in-memory recommendation and
+    similarity indexes are not touched; refresh them afterwards.
+
+    Returns:
+    int: Number of jobs whose skills changed
+    """
+    query = select(Job.id, Job.description).order_by(Job.id)
+    if active_only:
+        query = query.where(Job.is_active == True)
+    rows = db.execute(query).all()
+    if not rows:
+        return 0
+
+    matcher = get_skill_matcher(db)
+    extracted = extract_skills_batch([description for _, description in rows], matcher, workers, chunk_size)
+    skill_ids = skill_resolver.resolve(db, [name for names in extracted for name in names])
+
+    current: Dict[int, set] = defaultdict(set)
+    for job_id, skill_id in db.execute(select(job_skill.c.job_id, job_skill.c.skill_id)):
+        current[job_id].add(skill_id)
+
+    changed: Dict[int, set] = {}
+    for (job_id, _), names in zip(rows, extracted):
+        new_ids = {skill_ids[name] for name in names}
+        if new_ids != current.get(job_id, set()):
+            changed[job_id] = new_ids
+
+    if changed:
+        db.execute(delete(job_skill).where(job_skill.c.job_id.in_(list(changed))))
+        pairs = [
+            {"job_id": job_id, "skill_id": skill_id}
+            for job_id, new_ids in changed.items()
+            for skill_id in new_ids
+        ]
+        if pairs:
+            db.execute(insert(job_skill), pairs)
+        db.execute(update(Job), [
+            {"id": job_id, "skill_minhash": skill_signature(new_ids)}
+            for job_id, new_ids in changed.items()
+        ])
+    db.commit()
+    return len(changed)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-extract the required skills of stored jobs")
+    parser.add_argument("--active-only", action="store_true", help="skip inactive jobs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="descriptions per work unit")
+    args = parser.parse_args(argv)
+
+    from app.db.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        changed = reextract_job_skills(db, args.active_only, args.workers, args.chunk_size)
+    finally:
+        db.close()
+    print(f"Updated skills of {changed} jobs")
+
+
+# Run with: python -m app.services.skill_extraction --active-only
+if __name__ == "__main__":
+    main()
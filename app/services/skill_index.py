@@ -0,0 +1,179 @@
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.models.skill import job_skill
+from app.schemas.job import RecommendationFilters
+from app.services.job_dedup import duplicate_jobs_index
+from app.services.job_similarity import similar_jobs_index
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_filters import (
+    FACET_COLUMNS, JobFacets, Keyset, facets_from_job, facets_match, is_after, is_empty, make_facets
+)
+
+
+class SkillJobIndex:
+    """
+    Inverted index from skill id to the active jobs requiring it.
+
+    Recommending only touches the postings of the user's own skills, so jobs
+    sharing no skill with the user are never scored. The index is loaded
+    from the database on first use and then kept up to date incrementally
+    by the code paths that add or retire jobs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings: Dict[int, Set[int]] = defaultdict(set)
+        self.job_skill_counts: Dict[int, int] = {}
+        self._job_skills: Dict[int, Tuple[int, ...]] = {}
+        self.job_facets: Dict[int, JobFacets] = {}
+        self.is_loaded = False
+
+    def refresh(self, db: Session) -> None:
+        """Rebuild the whole index from the active jobs in the database"""
+        rows = db.execute(
+            select(job_skill.c.job_id, job_skill.c.skill_id)
+            .join(Job, Job.id == job_skill.c.job_id)
+            .where(Job.is_active == True)
+        ).all()
+
+        job_skills: Dict[int, List[int]] = defaultdict(list)
+        for job_id, skill_id in rows:
+            job_skills[job_id].append(skill_id)
+
+        facets = {
+            job_id: make_facets(*columns)
+            for job_id, *columns in db.execute(
+                select(Job.id, *FACET_COLUMNS).where(Job.is_active == True)
+            )
+        }
+
+        with self._lock:
+            self.postings = defaultdict(set)
+            self.job_skill_counts = {}
+            self._job_skills = {}
+            self.job_facets = {}
+            for job_id, skill_ids in job_skills.items():
+                self._add(job_id, skill_ids, facets.get(job_id))
+            self.is_loaded = True
+
+    def add_job(self, job_id: int, skill_ids: Iterable[int], facets: Optional[JobFacets] = None) -> None:
+        """Index (or re-index) an active job with its required skills"""
+        with self._lock:
+            if not self.is_loaded:
+                # Picked up by the full load on first use
+                return
+            self._remove(job_id)
+            self._add(job_id, skill_ids, facets)
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> None:
+        """Drop jobs that are no longer active"""
+        with self._lock:
+            if not self.is_loaded:
+                return
+            for job_id in job_ids:
+                self._remove(job_id)
+
+    def top_jobs(
+        self,
+        user_skill_ids: Iterable[int],
+        limit: int = 10,
+        filters: Optional[RecommendationFilters] = None,
+        after: Optional[Keyset] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Score the jobs sharing a skill with the user and return the best `limit`.
+
+        Scores follow the original recommender: the percentage of a job's
+        required skills the user has. Ties are broken by ascending job id.
+        Jobs not matching `filters`, or ranked at or before the `after`
+        keyset position, are dropped before selection.
+
+        Returns:
+        List[Tuple[int, float]]: (job_id, match_score) pairs, best first
+        """
+        if limit <= 0:
+            return []
+
+        matched: Dict[int, int] = defaultdict(int)
+        with self._lock:
+            for skill_id in set(user_skill_ids):
+                for job_id in self.postings.get(skill_id, ()):
+                    matched[job_id] += 1
+            scored = [
+                (count / self.job_skill_counts[job_id] * 100, job_id)
+                for job_id, count in matched.items()
+            ]
+            if not is_empty(filters):
+                scored = [
+                    item for item in scored
+                    if facets_match(filters, self.job_facets.get(item[1]))
+                ]
+        if after is not None:
+            scored = [item for item in scored if is_after(item[0], item[1], after)]
+
+        # Bounded heap of size `limit`
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+        return [(job_id, score) for score, job_id in best]
+
+    def _add(self, job_id: int, skill_ids: Iterable[int], facets: Optional[JobFacets]) -> None:
+        skill_ids = tuple(set(skill_ids))
+        # Jobs without required skills can never match
+        if not skill_ids:
+            return
+        for skill_id in skill_ids:
+            self.postings[skill_id].add(job_id)
+        self.job_skill_counts[job_id] = len(skill_ids)
+        self._job_skills[job_id] = skill_ids
+        if facets is not None:
+            self.job_facets[job_id] = facets
+
+    def _remove(self, job_id: int) -> None:
+        for skill_id in self._job_skills.pop(job_id, ()):
+            posting = self.postings.get(skill_id)
+            if posting is not None:
+                posting.discard(job_id)
+                if not posting:
+                    del self.postings[skill_id]
+        self.job_skill_counts.pop(job_id, None)
+        self.job_facets.pop(job_id, None)
+
+
+skill_index = SkillJobIndex()
+
+
+def get_skill_index(db: Optional[Session] = None) -> SkillJobIndex:
+    """Return the shared index, loading it from the database on first use"""
+    if not skill_index.is_loaded and db is not None:
+        skill_index.refresh(db)
+    return skill_index
+
+
+def index_jobs(jobs: Iterable[Job]) -> None:
+    """
+    Keep the shared skill, similar-jobs and duplicate indexes in sync with
+    jobs that were just saved, and invalidate recommendations cached
+    against the previous catalog, once for the whole batch.
+    """
+    indexed = False
+    for job in jobs:
+        if job.is_active:
+            skill_index.add_job(job.id, [skill.id for skill in job.required_skills], facets_from_job(job))
+        else:
+            skill_index.remove_jobs([job.id])
+        similar_jobs_index.add_job(job)
+        duplicate_jobs_index.add_job(job)
+        indexed = True
+    if indexed:
+        recommendation_cache.bump_catalog()
+
+
+def index_job(job: Job) -> None:
+    """index_jobs for a single saved job"""
+    index_jobs([job])
@@ -0,0 +1,227 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.skill import Skill
+
+# Skills looked for even before they exist in the skills table
+DEFAULT_SKILLS = [
+    "python", "javascript", "react", "node.js", "django", "flask", "sql", "postgresql",
+    "mongodb", "aws", "docker", "kubernetes", "html", "css", "typescript", "java",
+    "c++", "c#", "ruby", "php", "go", "swift", "kotlin", "rust", "scala", "r",
+    "machine learning", "data science", "ai", "artificial intelligence", "deep learning",
+    "devops", "ci/cd", "git", "agile", "scrum", "rest api", "graphql", "redux",
+    "angular", "vue.js", "express", "spring", "asp.net", "laravel", "rails"
+]
+
+# Alternative spellings, mapped to the canonical skill name
+SKILL_ALIASES = {
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "postgres": "postgresql",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "ts": "typescript",
+    "vue": "vue.js",
+    "vuejs": "vue.js",
+    "angularjs": "angular",
+    "ruby on rails": "rails",
+    "amazon web services": "aws",
+    "ci / cd": "ci/cd",
+    "continuous integration": "ci/cd",
+    "restful api": "rest api",
+    "restful apis": "rest api",
+    "rest apis": "rest api",
+    "ml": "machine learning",
+    "spring boot": "spring",
+    "expressjs": "express",
+    "express.js": "express",
+    ".net": "asp.net",
+}
+
+# Alphabetic patterns this short ("go", "r", "ai") are also everyday words
+# or abbreviations. They are only matched when not written in all
+# lowercase, so prose like "ready to go" does not yield Go, and not when
+# joined to the next word by one of SHORT_PATTERN_JOINERS or preceded by
+# "&", so "Go-to person" and "R&D" do not yield Go or R. Short patterns
+# with symbols, like "c#", are distinctive and always matched.
+CASE_SENSITIVE_MAX_LENGTH = 2
+SHORT_PATTERN_JOINERS = "-&"
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over skill names and aliases.
+
+    Finds every skill in a single pass over the text, in time linear in the
+    text length regardless of how many skills are known. A match only counts
+    on token boundaries, so "go" does not fire inside "google" and "java"
+    does not fire inside "javascript".
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Parameters:
+        patterns (Dict[str, str]): Lowercase pattern -> canonical skill name
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+
+        for pattern, canonical in patterns.items():
+            if pattern:
+                self._insert(pattern, canonical)
+        self._build_failure_links()
+
+    def _insert(self, pattern: str, canonical: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), canonical))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @staticmethod
+    def _normalize(text: str) -> Tuple[str, str]:
+        """
+        Lowercase `text` and collapse whitespace runs into single spaces.
+
+        Also returns the original characters aligned with the normalized
+        ones, for the case check on short patterns.
+        """
+        normalized, original = [], []
+        previous_space = False
+        for char in text:
+            if char.isspace():
+                if previous_space:
+                    continue
+                previous_space = True
+                normalized.append(" ")
+                original.append(" ")
+                continue
+            previous_space = False
+            lowered = char.lower()
+            # Case folding may change the length (e.g. "İ"); keep alignment
+            normalized.append(lowered)
+            original.append(char * len(lowered) if len(lowered) > 1 else char)
+        return "".join(normalized), "".join(original)
+
+    @staticmethod
+    def _ambiguous(lowered: str, original: str, start: int, end: int) -> bool:
+        """Whether a short match at lowered[start:end + 1] is likely not a skill"""
+        if not lowered[start:end + 1].isalpha():
+            return False
+        if original[start:end + 1].islower():
+            return True
+        if end + 1 < len(lowered) and lowered[end + 1] in SHORT_PATTERN_JOINERS:
+            return True
+        return start > 0 and lowered[start - 1] == "&"
+
+    def find(self, text: str) -> List[str]:
+        """Canonical names of the skills found in `text`, in order of first appearance"""
+        if not text:
+            return []
+        lowered, original = self._normalize(text)
+
+        found: Dict[str, None] = {}
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            for length, canonical in output[state]:
+                start = end - length + 1
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                    continue
+                if end + 1 < len(lowered) and _is_word_char(lowered[end + 1]) and _is_word_char(lowered[end]):
+                    continue
+                if length <= CASE_SENSITIVE_MAX_LENGTH and self._ambiguous(lowered, original, start, end):
+                    continue
+                found.setdefault(canonical, None)
+        return list(found)
+
+
+def build_patterns(skill_names: Iterable[str]) -> Dict[str, str]:
+    """Map lowercase patterns to canonical names from the catalog plus aliases"""
+    patterns: Dict[str, str] = {}
+    for name in list(skill_names) + DEFAULT_SKILLS:
+        if name and name.strip():
+            patterns.setdefault(name.strip().lower(), name.strip())
+    for alias, canonical in SKILL_ALIASES.items():
+        patterns.setdefault(alias, patterns.get(canonical, canonical))
+    return patterns
+
+
+class SkillMatcherCache:
+    """
+    Process-wide SkillMatcher, rebuilt only when the skill catalog changes.
+
+    Code that adds skills calls invalidate(); changes made by other
+    processes are picked up by re-checking the catalog's size and highest
+    id at most every `check_interval` seconds.
+    """
+
+    def __init__(self, check_interval: float = 300):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._matcher: Optional[SkillMatcher] = None
+        self._catalog_version: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._matcher = None
+
+    def get(self, db: Optional[Session] = None) -> SkillMatcher:
+        with self._lock:
+            stale = self._matcher is None or time.monotonic() - self._checked_at > self.check_interval
+            if stale and db is not None:
+                version = tuple(db.execute(select(func.count(Skill.id), func.coalesce(func.max(Skill.id), 0))).one())
+                self._checked_at = time.monotonic()
+                if self._matcher is None or version != self._catalog_version:
+                    names = db.execute(select(Skill.name).order_by(Skill.id)).scalars().all()
+                    self._matcher = SkillMatcher(build_patterns(names))
+                    self._catalog_version = version
+            elif self._matcher is None:
+                # No database at hand: fall back to the built-in skills
+                self._matcher = SkillMatcher(build_patterns([]))
+            return self._matcher
+
+
+skill_matcher_cache = SkillMatcherCache()
+
+
+def get_skill_matcher(db: Optional[Session] = None) -> SkillMatcher:
+    return skill_matcher_cache.get(db)
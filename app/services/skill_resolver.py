@@ -0,0 +1,75 @@
+import threading
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.skill import Skill
+
+
+class SkillResolver:
+    """
+    Process-local skill name -> id map.
+
+    A batch of names is resolved with at most one SELECT for the names not
+    cached yet and one INSERT ... ON CONFLICT DO NOTHING RETURNING for the
+    ones that do not exist. New skills are committed right away so only
+    ids that exist for every session are ever cached. A concurrent sync
+    inserting the same name makes our insert skip it, and the name is then
+    read back with a second SELECT.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+    def resolve(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """Map skill names to ids, creating the skills that do not exist yet"""
+        wanted = set(names)
+        with self._lock:
+            ids = {name: self._ids[name] for name in wanted if name in self._ids}
+        missing = wanted - ids.keys()
+        if not missing:
+            return ids
+
+        found = self._select(db, missing)
+        missing -= found.keys()
+        if missing:
+            created = db.execute(
+                insert(Skill)
+                .values([{"name": name} for name in sorted(missing)])
+                .on_conflict_do_nothing(index_elements=[Skill.name])
+                .returning(Skill.name, Skill.id)
+            ).all()
+            db.commit()
+            found.update(created)
+            missing -= found.keys()
+            if missing:
+                # Inserted by a concurrent sync between our SELECT and INSERT
+                found.update(self._select(db, missing))
+
+        with self._lock:
+            self._ids.update(found)
+        ids.update(found)
+        return ids
+
+    def skills(self, db: Session, names: Iterable[str]) -> List[Skill]:
+        """Skill rows for `names`, in the order given, loaded in one query"""
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+        ids = self.resolve(db, names)
+        by_id = {skill.id: skill for skill in db.query(Skill).filter(Skill.id.in_(ids.values()))}
+        return [by_id[ids[name]] for name in names if ids[name] in by_id]
+
+    @staticmethod
+    def _select(db: Session, names: Iterable[str]) -> Dict[str, int]:
+        return dict(db.execute(select(Skill.name, Skill.id).where(Skill.name.in_(list(names)))).all())
+
+
+skill_resolver = SkillResolver()
@@ -0,0 +1,369 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.http_fetch import is_not_modified
+from app.services.job_fingerprint import job_content_hash, job_source_key
+from app.services.job_persistence import stored_content_hashes, touch_jobs, upsert_jobs
+from app.services.skill_extraction import extract_skills_batch
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+
+
+class SyncTask(NamedTuple):
+    """One search of a sync: a job source and the terms it is searched with"""
+    source: Any  # A JobScraper or APIJobCollector
+    terms: Dict[str, Any]
+
+
+class SyncTaskResult:
+    """What one search fetched and changed during a sync"""
+
+    def __init__(self, task: SyncTask):
+        self.task = task
+        self.pages = 0
+        self.not_modified = 0  # Pages the server confirmed unchanged, whose jobs were only marked as seen
+        self.jobs = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.duplicates = 0
+        self.errors = 0
+        self.job_ids: Set[int] = set()
+
+
+class StageStats:
+    """Counters of one pipeline stage"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy_seconds = 0.0  # Summed over the stage's workers
+        self.blocked_seconds = 0.0  # Waiting for room in the next stage's queue
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<8} workers {self.workers:<3} in {self.items_in:<7} out {self.items_out:<7} "
+            f"errors {self.errors:<4} busy {self.busy_seconds:8.2f}s blocked {self.blocked_seconds:8.2f}s"
+        )
+
+
+class SyncPipelineResult(NamedTuple):
+    """Outcome of SyncPipeline.run"""
+    tasks: List[SyncTaskResult]
+    stages: List[StageStats]
+    seconds: float
+    retired: int = 0  # Jobs retired after the crawl, set by JobSyncService
+
+    @property
+    def job_ids(self) -> Set[int]:
+        """Every job seen by the sync"""
+        return set().union(*(task.job_ids for task in self.tasks))
+
+    @property
+    def changed(self) -> int:
+        """Jobs inserted, updated or retired, i.e. changes to the active catalog"""
+        return sum(task.inserted + task.updated for task in self.tasks) + self.retired
+
+    def report(self) -> str:
+        lines = [f"Sync pipeline: {len(self.tasks)} searches, {len(self.job_ids)} jobs in {self.seconds:.2f}s"]
+        lines.extend(f"  {stage}" for stage in self.stages)
+        return "\n".join(lines)
+
+
+class SyncPipeline:
+    """
+    Crawls job sources in four stages connected by bounded queues:
+
+    fetch    searches run concurrently on the event loop; all searches of
+             a source share one pooled fetcher, so its rate budget holds
+    parse    pages are turned into job data on a thread pool; a page the
+             server reports not modified whose postings are all stored is
+             not parsed, its postings are only marked as seen
+    extract  skills are extracted in batches on a thread pool, only for
+             postings whose content hash is not stored yet
+    persist  batches are upserted, and unchanged pages' postings marked as
+             seen, by a single writer on the sync's session
+
+    A full queue makes the stage feeding it wait, so memory stays bounded
+    however large the crawl, while network, parsing, extraction and
+    database writes overlap instead of taking turns.
+
+    Sources provide create_fetcher(), an async generator
+    fetch_pages(fetcher, **terms) of (context, response) pairs,
+    parse_page(context, response, **terms) returning job data, and
+    page_source_keys(context, response, **terms) returning the source keys
+    of a page's postings without parsing them fully, as IndeedScraper and
+    AdzunaJobCollector do.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        fetch_concurrency: Optional[int] = None,
+        parse_workers: Optional[int] = None,
+        extract_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.db = db
+        self.fetch_concurrency = fetch_concurrency or settings.SYNC_FETCH_CONCURRENCY
+        self.parse_workers = parse_workers or settings.SYNC_PARSE_WORKERS
+        self.extract_workers = extract_workers or settings.SYNC_EXTRACT_WORKERS
+        self.queue_size = queue_size or settings.SYNC_QUEUE_SIZE
+        self.batch_size = batch_size or settings.SYNC_BATCH_SIZE
+
+    def run(self, tasks: Sequence[SyncTask]) -> SyncPipelineResult:
+        """Crawl every search and save its jobs; a failing search or batch does not stop the others"""
+        started = time.perf_counter()
+        results = [SyncTaskResult(task) for task in tasks]
+        stages = {
+            "fetch": StageStats("fetch", self.fetch_concurrency),
+            "parse": StageStats("parse", self.parse_workers),
+            "extract": StageStats("extract", self.extract_workers),
+            "persist": StageStats("persist", 1),
+        }
+        asyncio.run(self._run(results, stages, get_skill_matcher(self.db)))
+        return SyncPipelineResult(results, list(stages.values()), time.perf_counter() - started)
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, item: Any, stats: StageStats) -> float:
+        started = time.perf_counter()
+        await queue.put(item)
+        waited = time.perf_counter() - started
+        stats.blocked_seconds += waited
+        return waited
+
+    @staticmethod
+    async def _take(queue: asyncio.Queue, size: int) -> List[Any]:
+        """Wait for one item, then take whatever else is ready, up to `size` items"""
+        batch = [await queue.get()]
+        while len(batch) < size:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    @staticmethod
+    def _extract_skills(session: Session, matcher: SkillMatcher, jobs: List[Dict[str, Any]]) -> None:
+        """Fill in job_data["skills"] of the new and changed postings of a batch"""
+        for job_data in jobs:
+            job_data["source_key"] = job_source_key(job_data)
+            job_data["content_hash"] = job_content_hash(job_data)
+        try:
+            stored = stored_content_hashes(session, [job_data["source_key"] for job_data in jobs])
+        finally:
+            # Never keep a read transaction open between batches
+            session.rollback()
+        changed = [
+            job_data for job_data in jobs
+            if stored.get(job_data["source_key"]) != job_data["content_hash"] and job_data.get("skills") is None
+        ]
+        extracted = extract_skills_batch([job_data["description"] for job_data in changed], matcher)
+        for job_data, skills in zip(changed, extracted):
+            job_data["skills"] = skills
+
+    @staticmethod
+    def _unchanged_page_keys(session: Session, source: Any, context: Any, response: Any, terms: Dict[str, Any]) -> Optional[List[str]]:
+        """Source keys of a not-modified page whose postings are all stored, else None"""
+        keys = source.page_source_keys(context, response, **terms)
+        try:
+            stored = stored_content_hashes(session, keys)
+        finally:
+            session.rollback()
+        return keys if all(key in stored for key in keys) else None
+
+    async def _run(self, results: List[SyncTaskResult], stages: Dict[str, StageStats], matcher: SkillMatcher) -> None:
+        loop = asyncio.get_running_loop()
+        pending: asyncio.Queue = asyncio.Queue()
+        for index in range(len(results)):
+            pending.put_nowait(index)
+        pages: asyncio.Queue = asyncio.Queue(self.queue_size)
+        jobs: asyncio.Queue = asyncio.Queue(self.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(max(1, self.queue_size // self.batch_size))
+        # (task index, source keys) of pages only marked as seen
+        touches: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        parse_pool = ThreadPoolExecutor(self.parse_workers, thread_name_prefix="sync-parse")
+        extract_pool = ThreadPoolExecutor(self.extract_workers, thread_name_prefix="sync-extract")
+        persist_pool = ThreadPoolExecutor(1, thread_name_prefix="sync-persist")
+        # Each parse and extract worker looks up content hashes on its own session
+        parse_sessions = [Session(bind=self.db.get_bind()) for _ in range(self.parse_workers)]
+        sessions = [Session(bind=self.db.get_bind()) for _ in range(self.extract_workers)]
+
+        async def fetch(fetchers: Dict[int, Any]) -> None:
+            stats = stages["fetch"]
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = results[index]
+                source, terms = result.task
+                stats.items_in += 1
+                started = time.perf_counter()
+                waited = 0.0
+                try:
+                    async for context, response in source.fetch_pages(fetchers[id(source)], **terms):
+                        result.pages += 1
+                        stats.items_out += 1
+                        waited += await self._put(pages, (index, context, response), stats)
+                except Exception as e:
+                    stats.errors += 1
+                    result.errors += 1
+                    print(f"Error fetching {type(source).__name__} {terms}: {str(e)}")
+                stats.busy_seconds += time.perf_counter() - started - waited
+
+        async def parse(session: Session) -> None:
+            stats = stages["parse"]
+            while True:
+                index, context, response = await pages.get()
+                result = results[index]
+                source, terms = result.task
+                try:
+                    stats.items_in += 1
+                    if is_not_modified(response):
+                        started = time.perf_counter()
+                        try:
+                            keys = await loop.run_in_executor(
+                                parse_pool, self._unchanged_page_keys, session, source, context, response, terms
+                            )
+                        finally:
+                            stats.busy_seconds += time.perf_counter() - started
+                        if keys is not None:
+                            result.not_modified += 1
+                            result.jobs += len(keys)
+                            await self._put(touches, (index, keys), stats)
+                            continue
+                        # Postings not stored yet still go through the upsert
+                    started = time.perf_counter()
+                    try:
+                        parsed = await loop.run_in_executor(
+                            parse_pool, functools.partial(source.parse_page, context, response, **terms)
+                        )
+                    finally:
+                        stats.busy_seconds += time.perf_counter() - started
+                    result.jobs += len(parsed)
+                    for job_data in parsed:
+                        stats.items_out += 1
+                        await self._put(jobs, (index, job_data), stats)
+                except Exception as e:
+                    stats.errors += 1
+                    result.errors += 1
+                    print(f"Error parsing {type(source).__name__} page: {str(e)}")
+                finally:
+                    pages.task_done()
+
+        async def extract(session: Session) -> None:
+            stats = stages["extract"]
+            while True:
+                batch = await self._take(jobs, self.batch_size)
+                try:
+                    stats.items_in += len(batch)
+                    started = time.perf_counter()
+                    try:
+                        await loop.run_in_executor(
+                            extract_pool, self._extract_skills, session, matcher, [job_data for _, job_data in batch]
+                        )
+                    except Exception as e:
+                        # The upsert extracts whatever skills are missing itself
+                        stats.errors += 1
+                        print(f"Error extracting skills: {str(e)}")
+                    finally:
+                        stats.busy_seconds += time.perf_counter() - started
+                    stats.items_out += len(batch)
+                    await self._put(batches, batch, stats)
+                finally:
+                    for _ in batch:
+                        jobs.task_done()
+
+        async def persist() -> None:
+            stats = stages["persist"]
+            while True:
+                batch = await batches.get()
+                try:
+                    stats.items_in += len(batch)
+                    # Upserted per search, so each search's counts are known
+                    by_task: Dict[int, List[Dict[str, Any]]] = {}
+                    for index, job_data in batch:
+                        by_task.setdefault(index, []).append(job_data)
+                    for index, task_jobs in by_task.items():
+                        result = results[index]
+                        started = time.perf_counter()
+                        try:
+                            outcome = await loop.run_in_executor(persist_pool, upsert_jobs, self.db, task_jobs)
+                        except Exception as e:
+                            stats.errors += 1
+                            result.errors += 1
+                            print(f"Error saving {len(task_jobs)} jobs: {str(e)}")
+                            continue
+                        finally:
+                            stats.busy_seconds += time.perf_counter() - started
+                        stats.items_out += len(task_jobs)
+                        result.inserted += outcome.inserted
+                        result.updated += outcome.updated
+                        result.unchanged += outcome.unchanged
+                        result.duplicates += outcome.duplicates
+                        result.job_ids.update(outcome.job_ids)
+                finally:
+                    batches.task_done()
+
+        async def touch() -> None:
+            stats = stages["persist"]
+            while True:
+                index, keys = await touches.get()
+                result = results[index]
+                started = time.perf_counter()
+                try:
+                    stats.items_in += len(keys)
+                    seen = await loop.run_in_executor(persist_pool, touch_jobs, self.db, keys)
+                    stats.items_out += len(keys)
+                    result.unchanged += len(seen)
+                    result.job_ids.update(seen.values())
+                except Exception as e:
+                    stats.errors += 1
+                    result.errors += 1
+                    print(f"Error marking {len(keys)} unchanged jobs as seen: {str(e)}")
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+                    touches.task_done()
+
+        try:
+            async with AsyncExitStack() as stack:
+                fetchers: Dict[int, Any] = {}
+                for result in results:
+                    source = result.task.source
+                    if id(source) not in fetchers:
+                        fetchers[id(source)] = await stack.enter_async_context(source.create_fetcher())
+
+                workers = (
+                    [asyncio.create_task(parse(session)) for session in parse_sessions]
+                    + [asyncio.create_task(extract(session)) for session in sessions]
+                    + [asyncio.create_task(persist()), asyncio.create_task(touch())]
+                )
+                try:
+                    await asyncio.gather(*(fetch(fetchers) for _ in range(self.fetch_concurrency)))
+                    # Each stage hands its items on before marking them done,
+                    # so draining the queues in order drains the pipeline
+                    await pages.join()
+                    await jobs.join()
+                    await batches.join()
+                    await touches.join()
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            for pool in (parse_pool, extract_pool, persist_pool):
+                pool.shutdown(wait=True)
+            for session in parse_sessions + sessions:
+                session.close()
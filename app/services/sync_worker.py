@@ -0,0 +1,224 @@
+import argparse
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional, Sequence, Set
+
+import schedule
+from sqlalchemy import func, select, text, update
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.models.sync_run import SyncRun
+from app.services.job_dedup import duplicate_jobs_index
+from app.services.job_similarity import similar_jobs_index
+from app.services.job_sync import JobSyncService
+from app.services.recommendation_cache import recommendation_cache
+from app.services.recommendation_engine import recommendation_engine
+from app.services.skill_index import skill_index
+
+# Key of the PostgreSQL advisory lock held while a sync runs; the same in
+# every process sharing the database
+SYNC_LOCK_ID = 4817305561
+
+# Runs started by this process, whose catalog changes it already applied
+_local_runs: Set[int] = set()
+
+
+@contextmanager
+def advisory_lock(lock_id: int, bind: Optional[Engine] = None) -> Iterator[bool]:
+    """
+    Try to take a session-level PostgreSQL advisory lock without waiting,
+    yielding whether it was taken.
+
+    The lock is held on a connection of its own for the whole block, so
+    PostgreSQL also releases it if the process dies.
+    """
+    with (bind or engine).connect() as connection:
+        acquired = bool(connection.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": lock_id}).scalar())
+        connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": lock_id})
+                    connection.commit()
+                except Exception:
+                    # Never return a connection that may still hold the lock to the pool
+                    connection.invalidate()
+
+
+def run_sync(full: bool = False) -> bool:
+    """
+    Crawl the searches that are due (or all of them, if `full`), unless
+    another process is already running a sync.
+
+    The run is recorded in sync_runs so other processes know to reload
+    their indexes once it finishes, unless it changed no jobs. Recording
+    the run and crawling use separate short-lived sessions.
+
+    Returns:
+    bool: Whether a sync ran
+    """
+    with advisory_lock(SYNC_LOCK_ID) as acquired:
+        if not acquired:
+            print("Job sync already running in another process, skipping")
+            return False
+
+        with SessionLocal() as sync_db:
+            service = JobSyncService(sync_db)
+            tasks = service.tasks() if full else service.due_tasks()
+            if not tasks:
+                return False
+
+            with SessionLocal() as db:
+                run = SyncRun(started_at=datetime.now(), status="running")
+                db.add(run)
+                db.commit()
+                run_id = run.id
+            _local_runs.add(run_id)
+
+            result = None
+            error = None
+            try:
+                result = service.sync_jobs(tasks)
+            except Exception as e:
+                error = str(e)
+                print(f"Error running job sync: {error}")
+            finally:
+                with SessionLocal() as db:
+                    db.execute(
+                        update(SyncRun)
+                        .where(SyncRun.id == run_id)
+                        .values(
+                            finished_at=datetime.now(),
+                            status="succeeded" if result is not None else "failed",
+                            jobs_seen=len(result.job_ids) if result is not None else None,
+                            jobs_inserted=sum(task.inserted for task in result.tasks) if result is not None else None,
+                            jobs_updated=sum(task.updated for task in result.tasks) if result is not None else None,
+                            jobs_retired=result.retired if result is not None else None,
+                            error=error
+                        )
+                    )
+                    db.commit()
+    return True
+
+
+def reload_catalog() -> None:
+    """Rebuild this process's loaded in-memory job indexes from the database"""
+    with SessionLocal() as db:
+        for index in (skill_index, similar_jobs_index, duplicate_jobs_index, recommendation_engine):
+            if index.is_loaded:
+                index.refresh(db)
+    recommendation_cache.bump_catalog()
+
+
+def changed_jobs(run: SyncRun) -> bool:
+    """Whether a finished sync may have changed the active jobs"""
+    # A failed sync may still have saved some batches
+    if run.status != "succeeded":
+        return True
+    return bool(run.jobs_inserted or run.jobs_updated or run.jobs_retired)
+
+
+class CatalogWatcher:
+    """
+    Polls sync_runs and reloads the in-memory job indexes when a sync
+    finishes in another process, e.g. the standalone sync worker.
+    """
+
+    def __init__(self, poll_seconds: Optional[int] = None):
+        self.poll_seconds = poll_seconds or settings.SYNC_POLL_SECONDS
+        self.last_finished_at: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Reload the indexes if another process finished a sync that changed jobs since the last check"""
+        with SessionLocal() as db:
+            if self.last_finished_at is None:
+                # Indexes load lazily, so anything finished before now is in them
+                self.last_finished_at = db.execute(select(func.max(SyncRun.finished_at))).scalar() or datetime.min
+                return False
+            finished = db.execute(
+                select(SyncRun).where(SyncRun.finished_at > self.last_finished_at)
+            ).scalars().all()
+        if not finished:
+            return False
+        self.last_finished_at = max(run.finished_at for run in finished)
+        if not any(run.id not in _local_runs and changed_jobs(run) for run in finished):
+            return False
+        reload_catalog()
+        return True
+
+    def start(self) -> threading.Thread:
+        self.check()
+
+        def watch():
+            while not self._stop.wait(self.poll_seconds):
+                try:
+                    self.check()
+                except Exception as e:
+                    print(f"Error checking for finished job syncs: {str(e)}")
+
+        self._thread = threading.Thread(target=watch, daemon=True, name="catalog-watcher")
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def run_sync_safely(full: bool = False) -> bool:
+    """
+    run_sync for the scheduler loops: an error, e.g. a transient database
+    failure, is logged and only costs this tick instead of the loop.
+    """
+    try:
+        return run_sync(full)
+    except Exception as e:
+        print(f"Error running scheduled job sync: {str(e)}")
+        return False
+
+
+def start_sync_scheduler(check_minutes: Optional[float] = None) -> threading.Thread:
+    """Run run_sync every `check_minutes` in a daemon thread of this process"""
+    scheduler = schedule.Scheduler()
+    scheduler.every(check_minutes or settings.SYNC_CHECK_MINUTES).minutes.do(run_sync_safely)
+
+    def run_scheduler():
+        while True:
+            try:
+                scheduler.run_pending()
+            except Exception as e:
+                print(f"Error in job sync scheduler: {str(e)}")
+            time.sleep(60)
+
+    thread = threading.Thread(target=run_scheduler, daemon=True, name="job-sync-scheduler")
+    thread.start()
+    return thread
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run job syncs outside the API processes")
+    parser.add_argument("--once", action="store_true", help="run one sync and exit")
+    parser.add_argument("--all", action="store_true", help="crawl every search, not only those due")
+    parser.add_argument("--check-minutes", type=float, default=None, help="minutes between checks for due searches (default: SYNC_CHECK_MINUTES)")
+    args = parser.parse_args(argv)
+
+    check_minutes = args.check_minutes or settings.SYNC_CHECK_MINUTES
+    if args.once:
+        run_sync(full=args.all)
+        return
+    while True:
+        run_sync_safely(full=args.all)
+        time.sleep(check_minutes * 60)
+
+
+# Run with: python -m app.services.sync_worker
+# (and SYNC_IN_PROCESS=false for the API processes)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark the HTML parser backends on saved Indeed page fixtures.
+
+Times search-card and job-description extraction for every installed
+backend (selectolax, lxml, bs4) over the pages in benchmarks/fixtures/,
+checks that all backends extract the same data, and writes the results as
+JSON so runs from different commits can be compared.
+
+Run with:
+    python -m benchmarks.bench_html_parsing --output parsing.json
+    python -m benchmarks.bench_html_parsing --compare parsing.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from benchmarks.bench_recommendations import git_commit, percentile
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Fixture file -> extraction it is timed with
+FIXTURES = {
+    "indeed_search.html": "search_cards",
+    "indeed_job.html": "job_description",
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument("--backends", nargs="+", default=None, help="backends to time (default: all installed)")
+    parser.add_argument("--iterations", type=int, default=200, help="timed parses per fixture and backend")
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    return parser.parse_args(argv)
+
+
+def bench_extraction(extract, html: str, iterations: int) -> Dict[str, Any]:
+    extract(html)  # warm up
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        extract(html)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "mb_per_s": round(len(html.encode("utf-8")) / 1e6 / (statistics.fmean(latencies) / 1000), 2)
+    }
+
+
+def compare(results: Dict[str, Any], baseline_path: str) -> None:
+    """Print the p50 ratio of each backend against a previous run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    for fixture, backends in results["results"].items():
+        for backend, current in backends.items():
+            previous = baseline.get("results", {}).get(fixture, {}).get(backend)
+            if not previous:
+                continue
+            ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else float("inf")
+            flag = "  <-- regression" if ratio > 1.2 else ""
+            print(f"{fixture:<20} {backend:<12} p50_ms: {previous['p50_ms']:.3f} -> {current['p50_ms']:.3f} ms (x{ratio:.2f}){flag}", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    # Settings validate a database URL at import time, though none is used here
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+    from app.services.html_parsing import available_backends, get_html_parser
+
+    backends = args.backends or available_backends()
+    results: Dict[str, Any] = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "params": {"iterations": args.iterations},
+        "results": {}
+    }
+
+    for fixture, method in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+            html = f.read()
+
+        fixture_results = {}
+        extracted = {}
+        for backend in backends:
+            extract = getattr(get_html_parser(backend), method)
+            extracted[backend] = extract(html)
+            fixture_results[backend] = bench_extraction(extract, html, args.iterations)
+            print(f"{fixture:<20} {backend:<12} {fixture_results[backend]}", file=sys.stderr)
+
+        # Backends are interchangeable only if they agree on the data
+        reference = backends[0]
+        for backend in backends[1:]:
+            if extracted[backend] != extracted[reference]:
+                print(f"{fixture}: {backend} output differs from {reference}", file=sys.stderr)
+        results["results"][fixture] = fixture_results
+
+    output = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Benchmark a full job sync against local stand-ins for the job sources.
+
+Starts benchmarks.fixture_server, points IndeedScraper and
+AdzunaJobCollector at it, and times JobSyncService.sync_jobs end to end:
+fetching, parsing, skill extraction, upserts, retirement and, when jobs
+changed, the recommendation refresh. The first run ingests every posting;
+later runs recrawl the catalog after the server changed --churn of the
+descriptions.
+Reports jobs/sec, database writes and peak RSS per run as JSON so runs from
+different commits can be compared.
+
+Run with:
+    python -m benchmarks.bench_ingestion --database-url postgresql://localhost/bench --output ingestion.json
+    python -m benchmarks.bench_ingestion --database-url postgresql://localhost/bench --compare ingestion.json
+
+The upserts need PostgreSQL. All tables in that database are dropped and
+recreated, so never point it at a database you care about.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Any, Dict
+from urllib.request import Request, urlopen
+
+from benchmarks.bench_recommendations import git_commit
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark job ingestion against local job source fixtures")
+    parser.add_argument("--database-url", required=True, help="scratch PostgreSQL database; all its tables are dropped")
+    parser.add_argument("--runs", type=int, default=3, help="syncs to time; the first one starts from an empty database")
+    parser.add_argument("--pages", type=int, default=20, help="Adzuna result pages per search")
+    parser.add_argument("--per-page", type=int, default=50, help="Adzuna results per page")
+    parser.add_argument("--cards", type=int, default=20, help="Indeed job cards per search page")
+    parser.add_argument("--churn", type=float, default=0.1, help="share of postings changed between runs")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mean fixture server response delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with a 503")
+    parser.add_argument("--requests-per-second", type=float, default=500.0, help="per-host rate budget of the fetchers")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight at once")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+    if not args.database_url.startswith("postgresql"):
+        parser.error("--database-url must be a PostgreSQL database")
+    return args
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fixture_server(port: int, args) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.fixture_server",
+            "--port", str(port),
+            "--latency-ms", str(args.latency_ms),
+            "--error-rate", str(args.error_rate),
+            "--pages", str(args.pages),
+            "--cards", str(args.cards),
+            "--churn", str(args.churn),
+            "--seed", str(args.seed),
+        ],
+        cwd=REPO_ROOT
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Fixture server did not start")
+
+
+class WriteCounter:
+    """Counts the write statements an engine executes, and the rows they touch"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self._lock = threading.Lock()
+        self.reset()
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def reset(self) -> None:
+        self.counts = {verb: {"statements": 0, "rows": 0} for verb in WRITE_STATEMENTS}
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb not in self.counts:
+            return
+        with self._lock:
+            self.counts[verb]["statements"] += 1
+            self.counts[verb]["rows"] += max(cursor.rowcount, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = json.loads(json.dumps(self.counts))
+        counts["statements"] = sum(counts[verb]["statements"] for verb in WRITE_STATEMENTS)
+        counts["rows"] = sum(counts[verb]["rows"] for verb in WRITE_STATEMENTS)
+        return counts
+
+
+def bench_sync(session_factory, writes: WriteCounter) -> Dict[str, Any]:
+    from app.services.job_sync import JobSyncService
+
+    writes.reset()
+    started = time.perf_counter()
+    with session_factory() as db, redirect_stdout(sys.stderr):
+        result = JobSyncService(db).sync_jobs()
+    seconds = time.perf_counter() - started
+    run: Dict[str, Any] = {
+        "seconds": seconds,
+        "writes": writes.snapshot(),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+    if result is None:
+        run["failed"] = True
+        return run
+
+    jobs = len(result.job_ids)
+    run.update(
+        jobs=jobs,
+        jobs_per_s=jobs / seconds if seconds else 0.0,
+        pipeline_seconds=result.seconds,
+        pages=sum(task.pages for task in result.tasks),
+        inserted=sum(task.inserted for task in result.tasks),
+        updated=sum(task.updated for task in result.tasks),
+        unchanged=sum(task.unchanged for task in result.tasks),
+        duplicates=sum(task.duplicates for task in result.tasks),
+        errors=sum(task.errors for task in result.tasks),
+        stages={
+            stage.name: {
+                "items_in": stage.items_in,
+                "errors": stage.errors,
+                "busy_seconds": stage.busy_seconds,
+                "blocked_seconds": stage.blocked_seconds
+            }
+            for stage in result.stages
+        }
+    )
+    return run
+
+
+def compare(results: Dict[str, Any], baseline_path: str) -> None:
+    """Print the jobs/sec and write statement ratios of each run against a previous run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    for index, (current, previous) in enumerate(zip(results["runs"], baseline.get("runs", []))):
+        if current.get("failed") or previous.get("failed"):
+            continue
+        ratio = current["jobs_per_s"] / previous["jobs_per_s"] if previous["jobs_per_s"] else float("inf")
+        flag = "  <-- regression" if ratio < 1 / 1.2 else ""
+        print(f"run {index} jobs_per_s: {previous['jobs_per_s']:.1f} -> {current['jobs_per_s']:.1f} (x{ratio:.2f}){flag}", file=sys.stderr)
+        before = previous["writes"]["statements"]
+        after = current["writes"]["statements"]
+        ratio = after / before if before else float("inf")
+        flag = "  <-- regression" if ratio > 1.2 else ""
+        print(f"run {index} write statements: {before} -> {after} (x{ratio:.2f}){flag}", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Settings are read at import time, so point the app at the scratch
+    # database and the fixture server first
+    os.environ.update({
+        "DATABASE_URL": args.database_url,
+        "INDEED_BASE_URL": base_url,
+        "ADZUNA_BASE_URL": base_url + "/v1/api/jobs",
+        "ADZUNA_APP_ID": "bench",
+        "ADZUNA_API_KEY": "bench",
+        "ADZUNA_MAX_PAGES": str(args.pages),
+        "ADZUNA_RESULTS_PER_PAGE": str(args.per_page),
+        "ADZUNA_REQUESTS_PER_SECOND": str(args.requests_per_second),
+        "SCRAPER_REQUESTS_PER_SECOND": str(args.requests_per_second),
+        "SCRAPER_BURST": str(args.concurrency),
+        "SCRAPER_MAX_CONCURRENCY": str(args.concurrency),
+        # Every run should fetch and parse the pages again
+        "HTTP_CACHE_PATH": "",
+    })
+
+    from app.db.base import Base
+    from app.db.database import SessionLocal, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    writes = WriteCounter(engine)
+
+    results: Dict[str, Any] = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "params": {
+            "pages": args.pages,
+            "per_page": args.per_page,
+            "cards": args.cards,
+            "churn": args.churn,
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "requests_per_second": args.requests_per_second,
+            "concurrency": args.concurrency,
+            "seed": args.seed
+        },
+        "runs": []
+    }
+
+    server = start_fixture_server(port, args)
+    try:
+        for index in range(args.runs):
+            if index:
+                urlopen(Request(base_url + "/_advance", method="POST")).read()
+            run = bench_sync(SessionLocal, writes)
+            summary = {key: value for key, value in run.items() if key != "stages"}
+            print(f"run {index}: {summary}", file=sys.stderr)
+            results["runs"].append(run)
+    finally:
+        server.terminate()
+        server.wait()
+
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    output = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Benchmark the job recommendation backends on synthetic catalogs.
+
+Generates Job/Skill/User data with a Zipf-like skill popularity (a few skills
+such as "python" appear in many jobs, most skills are rare) into a scratch
+database, then times get_recommended_jobs for every backend and writes the
+results as JSON so runs from different commits can be compared.
+
+Run with:
+    python -m benchmarks.bench_recommendations --sizes 1000 10000 --output bench.json
+    python -m benchmarks.bench_recommendations --sizes 1000 --compare bench.json
+
+The database defaults to a SQLite file next to this script; pass
+--database-url postgresql://... to benchmark against PostgreSQL. All tables
+in that database are dropped and recreated.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+DEFAULT_DATABASE_URL = "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.db")
+BACKENDS = ["index", "memory", "database", "precomputed"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark job recommendation backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000], help="number of jobs per catalog")
+    parser.add_argument("--skills", type=int, default=2000, help="number of distinct skills")
+    parser.add_argument("--users", type=int, default=500, help="number of users")
+    parser.add_argument("--queries", type=int, default=200, help="timed requests per backend")
+    parser.add_argument("--limit", type=int, default=10, help="recommendations per request")
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    return parser.parse_args(argv)
+
+
+def skill_sampler(rnd: random.Random, n_skills: int):
+    """Sample distinct skill ids with Zipf-like popularity"""
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(n_skills)]
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+
+    def sample(k: int) -> List[int]:
+        chosen = set()
+        while len(chosen) < k:
+            chosen.update(rnd.choices(range(1, n_skills + 1), cum_weights=cumulative, k=k - len(chosen)))
+        return list(chosen)
+
+    return sample
+
+
+def generate_catalog(engine, n_jobs: int, n_skills: int, n_users: int, seed: int) -> None:
+    """Recreate all tables and fill them with a synthetic catalog"""
+    from sqlalchemy import insert
+    from app.db.base import Base
+    from app.models.job import Job
+    from app.models.skill import Skill, job_skill
+    from app.models.user import User, user_skill
+
+    rnd = random.Random(seed)
+    sample_skills = skill_sampler(rnd, n_skills)
+    locations = ["Remote", "New York, NY", "San Francisco, CA", "London", "Berlin", "Austin, TX", "Bangalore"]
+    job_types = ["Full-time", "Part-time", "Contract"]
+    sources = ["Indeed", "Adzuna API"]
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    batch_size = 10000
+    with engine.begin() as connection:
+        connection.execute(insert(Skill), [
+            {"id": skill_id, "name": f"skill-{skill_id}", "category": ""}
+            for skill_id in range(1, n_skills + 1)
+        ])
+
+        for start in range(0, n_jobs, batch_size):
+            job_rows, link_rows = [], []
+            for job_id in range(start + 1, min(start + batch_size, n_jobs) + 1):
+                salary = rnd.choice([None, 40000, 60000, 80000, 120000])
+                job_rows.append({
+                    "id": job_id,
+                    "title": f"Job {job_id}",
+                    "company": f"Company {rnd.randrange(n_jobs // 10 + 1)}",
+                    "location": rnd.choice(locations),
+                    "description": "Synthetic job posting",
+                    "salary_min": salary,
+                    "salary_max": salary * 1.5 if salary else None,
+                    "job_type": rnd.choice(job_types),
+                    "remote": rnd.random() < 0.3,
+                    "url": f"https://jobs.example.com/{job_id}",
+                    "source": rnd.choice(sources),
+                    "posted_date": datetime.now(),
+                    "is_active": rnd.random() < 0.95
+                })
+                n_required = min(max(int(rnd.gauss(5, 2)), 1), 15)
+                link_rows.extend({"job_id": job_id, "skill_id": skill_id} for skill_id in sample_skills(n_required))
+            connection.execute(insert(Job), job_rows)
+            connection.execute(insert(job_skill), link_rows)
+
+        user_rows, user_skill_rows = [], []
+        for user_id in range(1, n_users + 1):
+            user_rows.append({
+                "id": user_id,
+                "email": f"user{user_id}@example.com",
+                "hashed_password": "",
+                "full_name": f"User {user_id}",
+                "is_active": True
+            })
+            n_known = min(max(int(rnd.gauss(8, 4)), 1), 30)
+            user_skill_rows.extend({"user_id": user_id, "skill_id": skill_id} for skill_id in sample_skills(n_known))
+        connection.execute(insert(User), user_rows)
+        connection.execute(insert(user_skill), user_skill_rows)
+
+
+def build_backend(db, backend: str) -> None:
+    """Do the one-off work a backend needs before serving requests"""
+    from app.services.recommendation_engine import recommendation_engine
+    from app.services.score_store import rebuild_all_scores
+    from app.services.skill_index import skill_index
+
+    if backend == "index":
+        skill_index.refresh(db)
+    elif backend == "memory":
+        recommendation_engine.refresh(db)
+    elif backend == "precomputed":
+        rebuild_all_scores(db)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def bench_backend(session_factory, backend: str, args) -> Dict[str, Any]:
+    from app.core.config import settings
+    from app.models.user import User
+    from app.services.job_recommendations import get_recommended_jobs
+    from app.services.recommendation_cache import recommendation_cache
+
+    settings.RECOMMENDATION_BACKEND = backend
+    rnd = random.Random(args.seed)
+    db = session_factory()
+    try:
+        started = time.perf_counter()
+        build_backend(db, backend)
+        build_seconds = time.perf_counter() - started
+
+        users = db.query(User).all()
+        for user in users:
+            user.skills  # keep the lazy load out of the timed region
+
+        latencies = []
+        for _ in range(args.queries):
+            user = rnd.choice(users)
+            # Time the backend itself, not the recommendation cache
+            recommendation_cache.bump_catalog()
+            started = time.perf_counter()
+            get_recommended_jobs(db, user, args.limit)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        # One warm request to measure a cache hit
+        get_recommended_jobs(db, user, args.limit)
+        started = time.perf_counter()
+        get_recommended_jobs(db, user, args.limit)
+        cached_ms = (time.perf_counter() - started) * 1000
+
+        # Memory is traced in a separate pass since tracing skews timings
+        tracemalloc.start()
+        build_backend(db, backend)
+        for user in users[:10]:
+            recommendation_cache.bump_catalog()
+            get_recommended_jobs(db, user, args.limit)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    return {
+        "build_seconds": round(build_seconds, 4),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "cached_ms": round(cached_ms, 3),
+        "peak_python_bytes": peak_bytes,
+        "queries": len(latencies)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: Dict[str, Any], baseline_path: str) -> None:
+    """Print the p50/p99 ratio of each backend against a previous run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    for size, backends in results["results"].items():
+        for backend, current in backends.items():
+            previous = baseline.get("results", {}).get(size, {}).get(backend)
+            if not previous:
+                continue
+            for metric in ("p50_ms", "p99_ms"):
+                ratio = current[metric] / previous[metric] if previous[metric] else float("inf")
+                flag = "  <-- regression" if ratio > 1.2 else ""
+                print(f"{size:>8} {backend:<12} {metric}: {previous[metric]:.3f} -> {current[metric]:.3f} ms (x{ratio:.2f}){flag}", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    # Settings are read at import time, so point the app at the scratch database first
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from app.db.database import SessionLocal, engine
+
+    results: Dict[str, Any] = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "params": {
+            "skills": args.skills,
+            "users": args.users,
+            "queries": args.queries,
+            "limit": args.limit,
+            "seed": args.seed
+        },
+        "results": {}
+    }
+
+    for size in args.sizes:
+        print(f"Generating catalog with {size} jobs...", file=sys.stderr)
+        started = time.perf_counter()
+        generate_catalog(engine, size, args.skills, args.users, args.seed)
+        print(f"Generated in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+        size_results = {}
+        for backend in args.backends:
+            size_results[backend] = bench_backend(SessionLocal, backend, args)
+            print(f"{size:>8} {backend:<12} {size_results[backend]}", file=sys.stderr)
+        results["results"][str(size)] = size_results
+
+    results["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    output = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Local stand-in for the job sources, serving the recorded pages in
+benchmarks/fixtures/ so a job sync can be crawled offline.
+
+Indeed searches (/jobs?q=...&l=...) get the recorded search page with its
+cards replaced by synthetic postings, each linking to a job page
+(/rc/clk?jk=...) that is the recorded job page with a synthetic
+description. Adzuna searches (.../{country}/search/{page}) get the recorded
+response shape with `results_per_page` synthetic results and a `count` of
+--pages pages. Postings are derived from the search terms and --seed alone,
+so restarts serve the same catalog. POST /_advance starts a new generation
+in which a --churn share of the postings has a changed description.
+
+Every request waits --latency-ms (jittered by +-50%) and fails with a 503
+with probability --error-rate. Point the app at it with:
+
+    INDEED_BASE_URL=http://127.0.0.1:8765
+    ADZUNA_BASE_URL=http://127.0.0.1:8765/v1/api/jobs
+
+Run with:
+    python -m benchmarks.fixture_server --port 8765 --latency-ms 50 --error-rate 0.02
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+CARD_START = '<div class="jobsearch-SerpJobCard'
+ADZUNA_SEARCH_PATH = re.compile(r"/(?P<country>[a-z]{2})/search/(?P<page>\d+)$")
+
+# Titles, companies and locations combine into enough distinct postings
+# that only a few collide, as the same job listed twice would
+LEVELS = ["Junior", "", "Senior", "Staff", "Lead"]
+ROLES = [
+    "Python Developer", "Backend Engineer", "Full Stack Developer", "React Developer",
+    "Frontend Engineer", "DevOps Engineer", "Data Engineer", "Machine Learning Engineer",
+    "Site Reliability Engineer", "Software Engineer", "Platform Engineer", "Cloud Engineer",
+]
+COMPANY_NAMES = [
+    "Initech", "Globex", "Hooli", "Umbrella", "Stark", "Wayne", "Acme", "Soylent", "Vandelay",
+    "Cyberdyne", "Tyrell", "Wonka", "Aperture", "Massive Dynamic", "Oscorp", "Pied Piper",
+    "Gringotts", "Nakatomi", "Monarch", "Dunder Mifflin",
+]
+COMPANY_SUFFIXES = ["LLC", "Inc", "Corporation", "Labs", "Systems", "Group", "Technologies", "Software", "Digital", "Analytics"]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "London", "Berlin"]
+SKILLS = [
+    "python", "django", "flask", "fastapi", "react", "typescript", "javascript", "node.js",
+    "postgresql", "mysql", "redis", "docker", "kubernetes", "aws", "gcp", "azure", "terraform",
+    "java", "go", "rust", "graphql", "rest", "kafka", "spark", "pandas", "sql", "linux", "git",
+    "ci/cd", "agile", "machine learning", "tensorflow", "pytorch", "html", "css",
+]
+FILLER = [
+    "we", "are", "looking", "for", "an", "engineer", "to", "build", "and", "run", "services",
+    "with", "the", "team", "in", "that", "own", "code", "review", "testing", "scalable", "apis",
+    "ownership", "values", "product", "customers", "ship", "features", "across", "stack",
+]
+
+
+class Posting(NamedTuple):
+    title: str
+    company: str
+    location: str
+    paragraphs: List[str]
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class Catalog:
+    """Deterministic synthetic postings, with a description churn per generation"""
+
+    def __init__(self, seed: int, churn: float):
+        self.seed = seed
+        self.churn = churn
+        self.generation = 0
+
+    def _variant(self, key: str) -> int:
+        """Latest generation in which the posting's description changed"""
+        for generation in range(self.generation, 0, -1):
+            if random.Random(_digest(self.seed, key, "churn", generation)).random() < self.churn:
+                return generation
+        return 0
+
+    def posting(self, key: str) -> Posting:
+        rnd = random.Random(_digest(self.seed, key))
+        title = f"{rnd.choice(LEVELS)} {rnd.choice(ROLES)}".strip()
+        company = f"{rnd.choice(COMPANY_NAMES)} {rnd.choice(COMPANY_SUFFIXES)}"
+        location = rnd.choice(LOCATIONS)
+        skills = rnd.sample(SKILLS, rnd.randint(3, 8))
+
+        rnd = random.Random(_digest(self.seed, key, self._variant(key)))
+        paragraphs = []
+        for _ in range(rnd.randint(3, 6)):
+            words = [
+                rnd.choice(skills) if rnd.random() < 0.2 else rnd.choice(FILLER)
+                for _ in range(rnd.randint(20, 60))
+            ]
+            paragraphs.append(" ".join(words).capitalize() + ".")
+        if location == "Remote":
+            paragraphs.append("This role is fully remote.")
+        return Posting(title, company, location, paragraphs)
+
+
+class Fixtures:
+    """The recorded pages, split around the parts replaced with synthetic postings"""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR):
+        with open(os.path.join(fixtures_dir, "indeed_search.html"), encoding="utf-8") as f:
+            search = f.read()
+        first = search.index(CARD_START)
+        second = search.index(CARD_START, first + 1)
+        end = search.index("</main>")
+        self.search_head = search[:first]
+        self.search_tail = search[end:]
+        card = search[first:second]
+        # Placeholders for the values of the recorded card
+        self.card = (
+            card.replace(re.search(r'data-jk="([^"]+)"', card).group(1), "{jk}")
+            .replace(re.search(r'title="([^"]+)"', card).group(1), "{title}")
+            .replace(re.search(r'class="company"><a[^>]*>([^<]+)<', card).group(1), "{company}")
+            .replace(re.search(r'data-rc-loc="([^"]+)"', card).group(1), "{location}")
+        )
+
+        with open(os.path.join(fixtures_dir, "indeed_job.html"), encoding="utf-8") as f:
+            job = f.read()
+        description = re.search(r'<div id="jobDescriptionText"[^>]*>', job)
+        self.job_head = job[:description.end()]
+        self.job_tail = job[job.index("</div>", description.end()):]
+        self.job_title = re.search(r'<h1[^>]*>([^<]+)</h1>', job).group(1)
+
+        with open(os.path.join(fixtures_dir, "adzuna_search.json"), encoding="utf-8") as f:
+            self.adzuna = json.load(f)
+
+    def search_page(self, cards: List[Tuple[str, Posting]]) -> str:
+        rendered = [
+            self.card.format(
+                jk=jk,
+                title=html.escape(posting.title),
+                company=html.escape(posting.company),
+                location=html.escape(posting.location)
+            )
+            for jk, posting in cards
+        ]
+        return self.search_head + "".join(rendered) + self.search_tail
+
+    def job_page(self, posting: Posting) -> str:
+        description = "\n" + "\n".join(f"<p>{html.escape(paragraph)}</p>" for paragraph in posting.paragraphs) + "\n"
+        return self.job_head.replace(self.job_title, html.escape(posting.title)) + description + self.job_tail
+
+    def adzuna_page(self, results: List[Tuple[str, Posting]], count: int, collected_at: str) -> Dict[str, Any]:
+        template = self.adzuna["results"][0]
+        page = dict(self.adzuna, count=count, results=[])
+        for key, posting in results:
+            job_id = str(int(_digest(key)[:10], 16))
+            result = json.loads(json.dumps(template))
+            result.update(
+                id=job_id,
+                title=posting.title,
+                description=" ".join(posting.paragraphs),
+                created=collected_at,
+                redirect_url=f"https://www.adzuna.com/land/ad/{job_id}",
+            )
+            result["company"]["display_name"] = posting.company
+            result["location"]["display_name"] = posting.location
+            page["results"].append(result)
+        return page
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, args):
+        super().__init__(address, FixtureHandler)
+        self.args = args
+        self.fixtures = Fixtures()
+        self.catalog = Catalog(args.seed, args.churn)
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.collected_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.args.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _delay_or_fail(self) -> bool:
+        """Wait the configured latency; True if this request should fail"""
+        args = self.server.args
+        with self.server.lock:
+            jitter = self.server.random.uniform(0.5, 1.5)
+            fail = self.server.random.random() < args.error_rate
+        if args.latency_ms:
+            time.sleep(args.latency_ms / 1000 * jitter)
+        return fail
+
+    def do_POST(self):
+        if urlsplit(self.path).path == "/_advance":
+            with self.server.lock:
+                self.server.catalog.generation += 1
+                generation = self.server.catalog.generation
+            self._send(200, json.dumps({"generation": generation}), "application/json")
+        else:
+            self._send(404, "Not found")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if self._delay_or_fail():
+            self._send(503, "Service unavailable")
+            return
+
+        adzuna_search = ADZUNA_SEARCH_PATH.search(url.path)
+        if url.path == "/jobs":
+            self._indeed_search(query.get("q", ""), query.get("l", ""))
+        elif url.path == "/rc/clk" and query.get("jk"):
+            self._indeed_job(query["jk"])
+        elif adzuna_search:
+            self._adzuna_search(adzuna_search.group("country"), int(adzuna_search.group("page")), query)
+        else:
+            self._send(404, "Not found")
+
+    def _indeed_search(self, keywords: str, location: str) -> None:
+        catalog = self.server.catalog
+        jks = [_digest("indeed", keywords, location, i)[:16] for i in range(self.server.args.cards)]
+        self._send(200, self.server.fixtures.search_page([(jk, catalog.posting(jk)) for jk in jks]))
+
+    def _indeed_job(self, jk: str) -> None:
+        self._send(200, self.server.fixtures.job_page(self.server.catalog.posting(jk)))
+
+    def _adzuna_search(self, country: str, page: int, query: Dict[str, str]) -> None:
+        per_page = int(query.get("results_per_page", 50))
+        count = self.server.args.pages * per_page
+        first = (page - 1) * per_page
+        keys = [
+            f"adzuna:{country}:{query.get('what', '')}:{query.get('where', '')}:{n}"
+            for n in range(first, min(first + per_page, count))
+        ]
+        results = [(key, self.server.catalog.posting(key)) for key in keys]
+        body = self.server.fixtures.adzuna_page(results, count, self.server.collected_at)
+        self._send(200, json.dumps(body), "application/json")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded job source pages with synthetic postings")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="mean response delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--pages", type=int, default=10, help="Adzuna result pages per search")
+    parser.add_argument("--cards", type=int, default=20, help="Indeed job cards per search page")
+    parser.add_argument("--churn", type=float, default=0.1, help="share of postings changed by POST /_advance")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    server = FixtureServer((args.host, args.port), args)
+    print(f"Serving job source fixtures on http://{args.host}:{server.server_address[1]}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
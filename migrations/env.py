@@ -19,6 +19,9 @@ from app.models.user import User  # Depends on user_skill
 # 3. Import models that depend on others
 from app.models.job import Job  # Depends on Skill via job_skill
 from app.models.application import Application  
+from app.models.user_job_score import UserJobScore
+from app.models.sync_run import SyncRun
+from app.models.crawl_schedule import CrawlSchedule
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -0,0 +1,121 @@
+"""Add jobs.posting_key and jobs.description_minhash, canonicalize jobs.source_key
+
+Revision ID: 0d9e6a4b3c15
+Revises: f1b7c2e94a06
+Create Date: 2026-10-17 21:12:09.550871
+
+"""
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, Optional, Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d9e6a4b3c15'
+down_revision: Union[str, None] = 'f1b7c2e94a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copies of the key functions of app.services.job_fingerprint as of
+# this revision, so later changes to them don't change what it writes
+_TRACKING_PARAMS = {"fbclid", "gclid", "ref", "referrer", "trk", "src"}
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "plc", "pvt"}
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in _TRACKING_PARAMS and not name.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/")
+    return host + path + ("?" + urlencode(query) if query else "")
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _normalize_company(company: Optional[str]) -> str:
+    words = _normalize_text(company).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def job_source_key(job_data: Dict[str, Any]) -> str:
+    url = job_data.get("url") or ""
+    if url:
+        text = "url:" + _canonical_url(url)
+    else:
+        parts = (job_data.get("source") or "", job_data.get("title") or "", job_data.get("company") or "")
+        text = "job:" + "\x1f".join(parts).lower()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def job_posting_key(job_data: Dict[str, Any]) -> Optional[str]:
+    title = _normalize_text(job_data.get("title"))
+    company = _normalize_company(job_data.get("company"))
+    if not title or not company or company == "unknown":
+        return None
+    text = "posting:" + "\x1f".join((title, company, _normalize_text(job_data.get("location"))))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('posting_key', sa.String(length=64), nullable=True))
+    # Existing rows are backfilled by the app the first time the
+    # duplicate index loads
+    op.add_column('jobs', sa.Column('description_minhash', sa.LargeBinary(), nullable=True))
+
+    # Source keys now hash the canonical URL, which SQL cannot compute:
+    # recompute both keys here. As before, only the oldest row of each key
+    # gets it and later duplicates keep NULL.
+    op.drop_index(op.f('ix_jobs_source_key'), table_name='jobs')
+    bind = op.get_bind()
+    jobs = sa.table(
+        'jobs',
+        sa.column('id', sa.Integer), sa.column('title', sa.String), sa.column('company', sa.String),
+        sa.column('location', sa.String), sa.column('url', sa.String), sa.column('source', sa.String),
+        sa.column('source_key', sa.String), sa.column('posting_key', sa.String)
+    )
+    seen_source_keys, seen_posting_keys, keys = set(), set(), []
+    for row in bind.execute(sa.select(jobs).order_by(jobs.c.id)).mappings():
+        source_key = job_source_key(row)
+        posting_key = job_posting_key(row)
+        keys.append({
+            'job_id': row['id'],
+            'new_source_key': source_key if source_key not in seen_source_keys else None,
+            'new_posting_key': posting_key if posting_key not in seen_posting_keys else None,
+        })
+        seen_source_keys.add(source_key)
+        seen_posting_keys.add(posting_key)
+    if keys:
+        bind.execute(
+            jobs.update()
+            .where(jobs.c.id == sa.bindparam('job_id'))
+            .values(source_key=sa.bindparam('new_source_key'), posting_key=sa.bindparam('new_posting_key')),
+            keys
+        )
+    op.create_index(op.f('ix_jobs_source_key'), 'jobs', ['source_key'], unique=True)
+    op.create_index(op.f('ix_jobs_posting_key'), 'jobs', ['posting_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobs_posting_key'), table_name='jobs')
+    op.drop_column('jobs', 'description_minhash')
+    op.drop_column('jobs', 'posting_key')
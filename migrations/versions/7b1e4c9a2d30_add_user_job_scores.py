@@ -0,0 +1,39 @@
+"""Add user_job_scores
+
+Revision ID: 7b1e4c9a2d30
+Revises: 3cad538d1022
+Create Date: 2026-10-17 10:12:05.481337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b1e4c9a2d30'
+down_revision: Union[str, None] = '3cad538d1022'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_job_scores',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'job_id')
+    )
+    op.create_index('ix_user_job_scores_user_id_rank', 'user_job_scores', ['user_id', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_job_scores_user_id_rank', table_name='user_job_scores')
+    op.drop_table('user_job_scores')
@@ -0,0 +1,40 @@
+"""Add sync_runs
+
+Revision ID: a5c3e7f19b28
+Revises: 0d9e6a4b3c15
+Create Date: 2026-10-17 23:40:18.203716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c3e7f19b28'
+down_revision: Union[str, None] = '0d9e6a4b3c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sync_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('jobs_seen', sa.Integer(), nullable=True),
+    sa.Column('jobs_inserted', sa.Integer(), nullable=True),
+    sa.Column('jobs_updated', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_runs_id'), 'sync_runs', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sync_runs_id'), table_name='sync_runs')
+    op.drop_table('sync_runs')
@@ -0,0 +1,43 @@
+"""Add crawl_schedules
+
+Revision ID: b92d4f06a1e3
+Revises: a5c3e7f19b28
+Create Date: 2026-10-18 00:31:47.905122
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b92d4f06a1e3'
+down_revision: Union[str, None] = 'a5c3e7f19b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('crawl_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=False),
+    sa.Column('query', sa.String(length=500), nullable=False),
+    sa.Column('interval_seconds', sa.Float(), nullable=False),
+    sa.Column('next_run_at', sa.DateTime(), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('change_rate', sa.Float(), nullable=True),
+    sa.Column('runs', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'query', name='uq_crawl_schedules_source_query')
+    )
+    op.create_index(op.f('ix_crawl_schedules_id'), 'crawl_schedules', ['id'], unique=False)
+    op.create_index(op.f('ix_crawl_schedules_next_run_at'), 'crawl_schedules', ['next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_crawl_schedules_next_run_at'), table_name='crawl_schedules')
+    op.drop_index(op.f('ix_crawl_schedules_id'), table_name='crawl_schedules')
+    op.drop_table('crawl_schedules')
@@ -0,0 +1,29 @@
+"""Add jobs.skill_minhash
+
+Revision ID: c4f2a81d9e57
+Revises: 7b1e4c9a2d30
+Create Date: 2026-10-17 14:41:27.903215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f2a81d9e57'
+down_revision: Union[str, None] = '7b1e4c9a2d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are backfilled by `python -m app.services.job_similarity`
+    op.add_column('jobs', sa.Column('skill_minhash', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'skill_minhash')
@@ -0,0 +1,36 @@
+"""Add jobs.retired_at and index active jobs by last_seen_at
+
+Revision ID: c7e05a3d9f41
+Revises: b92d4f06a1e3
+Create Date: 2026-10-18 01:18:52.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e05a3d9f41'
+down_revision: Union[str, None] = 'b92d4f06a1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('retired_at', sa.DateTime(), nullable=True))
+    # Retirement compares last_seen_at, so it must be set on every row
+    op.execute("UPDATE jobs SET last_seen_at = COALESCE(updated_at, posted_date, now()) WHERE last_seen_at IS NULL")
+    # Jobs already inactive count as retired when they were last seen
+    op.execute("UPDATE jobs SET retired_at = last_seen_at WHERE is_active = false")
+    op.create_index(op.f('ix_jobs_retired_at'), 'jobs', ['retired_at'], unique=False)
+    op.create_index('ix_jobs_active_last_seen_at', 'jobs', ['last_seen_at'], unique=False, postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_active_last_seen_at', table_name='jobs', postgresql_where=sa.text('is_active'))
+    op.drop_index(op.f('ix_jobs_retired_at'), table_name='jobs')
+    op.drop_column('jobs', 'retired_at')
@@ -0,0 +1,28 @@
+"""Add sync_runs.jobs_retired
+
+Revision ID: d61f0b8e2a94
+Revises: c7e05a3d9f41
+Create Date: 2026-10-18 14:06:31.517284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd61f0b8e2a94'
+down_revision: Union[str, None] = 'c7e05a3d9f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sync_runs', sa.Column('jobs_retired', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sync_runs', 'jobs_retired')
@@ -0,0 +1,35 @@
+"""Add jobs.content_hash, jobs.updated_at and jobs.last_seen_at
+
+Revision ID: e8a3d5c17b42
+Revises: c4f2a81d9e57
+Create Date: 2026-10-17 18:03:52.614027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3d5c17b42'
+down_revision: Union[str, None] = 'c4f2a81d9e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows without a hash are treated as changed on their next re-scrape
+    op.add_column('jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('jobs', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+    op.add_column('jobs', sa.Column('last_seen_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+    op.create_index(op.f('ix_jobs_content_hash'), 'jobs', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobs_content_hash'), table_name='jobs')
+    op.drop_column('jobs', 'last_seen_at')
+    op.drop_column('jobs', 'updated_at')
+    op.drop_column('jobs', 'content_hash')
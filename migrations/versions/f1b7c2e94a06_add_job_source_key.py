@@ -0,0 +1,48 @@
+"""Add jobs.source_key
+
+Revision ID: f1b7c2e94a06
+Revises: e8a3d5c17b42
+Create Date: 2026-10-17 19:26:40.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7c2e94a06'
+down_revision: Union[str, None] = 'e8a3d5c17b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('source_key', sa.String(length=64), nullable=True))
+    # Same key as app.services.job_fingerprint.job_source_key. Only the
+    # oldest row of each key gets it; existing duplicates keep NULL so
+    # nothing referencing them has to be rewritten.
+    op.execute("""
+        UPDATE jobs SET source_key = keyed.key
+        FROM (
+            SELECT DISTINCT ON (key) id, key
+            FROM (
+                SELECT id, encode(sha256(convert_to(
+                    CASE WHEN coalesce(url, '') <> '' THEN 'url:' || url
+                    ELSE 'job:' || lower(coalesce(source, '') || chr(31) || coalesce(title, '') || chr(31) || coalesce(company, ''))
+                    END, 'UTF8')), 'hex') AS key
+                FROM jobs
+            ) AS hashed
+            ORDER BY key, id
+        ) AS keyed
+        WHERE jobs.id = keyed.id
+    """)
+    op.create_index(op.f('ix_jobs_source_key'), 'jobs', ['source_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobs_source_key'), table_name='jobs')
+    op.drop_column('jobs', 'source_key')
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a scratch SQLite
+# database before anything imports it
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["HTTP_CACHE_PATH"] = ""
+
+import pytest
+from sqlalchemy import event
+
+from app.db.base import Base
+from app.db.database import SessionLocal, engine
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+class QueryCounter:
+    """Counts the statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, "after_cursor_execute", self._after_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "after_cursor_execute", self._after_execute)
+
+
+@pytest.fixture
+def count_queries():
+    return lambda: QueryCounter(engine)
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.services.crawl_scheduler import CrawlScheduler
+from app.services.job_scrapers import IndeedScraper
+from app.services.sync_pipeline import SyncPipeline, SyncTask
+
+
+class UnavailableFetcher:
+    """Stands in for AsyncFetcher against a source answering every request with a 503"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def fetch(self, url, params=None):
+        return httpx.Response(503, request=httpx.Request("GET", url))
+
+
+class UnavailableIndeedScraper(IndeedScraper):
+    def create_fetcher(self):
+        return UnavailableFetcher()
+
+
+def test_failed_search_is_retried_soon_instead_of_backing_off(db):
+    scheduler = CrawlScheduler(min_interval_hours=1, max_interval_hours=72, initial_interval_hours=6, jitter=0)
+    task = SyncTask(UnavailableIndeedScraper(db, base_url="http://indeed.test"), {"keywords": "python", "location": "Remote"})
+
+    result = SyncPipeline(db, fetch_concurrency=1, parse_workers=1, extract_workers=1).run([task])
+    (task_result,) = result.tasks
+    assert task_result.pages == 0
+    assert task_result.errors == 1
+
+    now = datetime(2026, 1, 1)
+    scheduler.record(db, result.tasks, now)
+    assert scheduler.due_tasks(db, [task], now + timedelta(hours=1)) == [task]
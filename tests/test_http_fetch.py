@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import httpx
+
+from app.services.http_fetch import AsyncFetcher
+
+
+def test_retry_waits_are_capped_and_do_not_hold_a_slot():
+    attempts = {}
+    finished = []
+
+    def handler(request):
+        path = request.url.path
+        attempts[path] = attempts.get(path, 0) + 1
+        if path == "/busy" and attempts[path] == 1:
+            return httpx.Response(503, headers={"Retry-After": "3600"})
+        return httpx.Response(200, text=path)
+
+    async def fetch(fetcher, url):
+        response = await fetcher.fetch(url)
+        finished.append(response.text)
+
+    async def run():
+        fetcher = AsyncFetcher(
+            max_concurrency=1, requests_per_second=1000, burst=10,
+            max_retries=1, max_retry_after=0.2, use_cache=False
+        )
+        async with fetcher:
+            await fetcher._client.aclose()
+            fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            await asyncio.gather(fetch(fetcher, "http://jobs.test/busy"), fetch(fetcher, "http://jobs.test/idle"))
+
+    started = time.monotonic()
+    asyncio.run(run())
+
+    assert time.monotonic() - started < 2
+    assert attempts == {"/busy": 2, "/idle": 1}
+    # The idle page went through while the busy one waited to retry
+    assert finished == ["/idle", "/busy"]
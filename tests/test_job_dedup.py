@@ -0,0 +1,39 @@
+from app.services.job_dedup import description_hasher, description_shingles, duplicate_identity, find_duplicate, same_job
+from app.services.minhash import LSHIndex
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to build and run our python services, "
+    "own the apis end to end and review code with a small team that values testing."
+)
+
+
+def signature(description):
+    return description_hasher.signature(description_shingles(description))
+
+
+def test_same_job_needs_same_company_title_and_compatible_location():
+    listing = duplicate_identity("Backend Engineer", "Initech LLC", "Remote")
+    assert same_job(listing, duplicate_identity("Backend engineer", "Initech", "Remote, US"))
+    assert not same_job(listing, duplicate_identity("Backend Engineer", "Globex", "Remote"))
+    assert not same_job(listing, duplicate_identity("Frontend Engineer", "Initech LLC", "Remote"))
+    assert not same_job(
+        duplicate_identity("Backend Engineer", "Initech", "Austin, TX"),
+        duplicate_identity("Backend Engineer", "Initech", "Dallas, TX")
+    )
+    assert not same_job(
+        duplicate_identity("Backend Engineer", "Unknown", "Remote"),
+        duplicate_identity("Backend Engineer", "Unknown", "Remote")
+    )
+
+
+def test_find_duplicate_skips_identical_descriptions_of_other_jobs():
+    lsh = LSHIndex(bands=8, rows=8)
+    identities = {
+        1: duplicate_identity("Backend Engineer", "Initech", "Austin, TX"),
+        2: duplicate_identity("Backend Engineer", "Globex", "Remote"),
+    }
+    for key in identities:
+        lsh.add(key, signature(DESCRIPTION))
+
+    assert find_duplicate(lsh, signature(DESCRIPTION), duplicate_identity("Backend Engineer", "Globex Inc", "Remote"), identities) == 2
+    assert find_duplicate(lsh, signature(DESCRIPTION), duplicate_identity("Backend Engineer", "Initech", "New York, NY"), identities) is None
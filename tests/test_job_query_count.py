@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.job import Job
+from app.models.skill import Skill
+from app.services.job_recommendations import _load_job_matches
+
+PAGE_SIZES = [1, 5, 50, 200]
+
+
+def add_jobs(db, n_jobs: int, skills_per_job: int = 3):
+    skills = [Skill(name=f"skill-{i}", category="test") for i in range(10)]
+    db.add_all(skills)
+    jobs = [
+        Job(
+            title=f"Job {i}",
+            company="Acme",
+            location="Remote",
+            description="Build things",
+            job_type="Full-time",
+            url=f"https://example.com/jobs/{i}",
+            source="test",
+            is_active=True,
+            required_skills=[skills[(i + k) % len(skills)] for k in range(skills_per_job)]
+        )
+        for i in range(n_jobs)
+    ]
+    db.add_all(jobs)
+    db.commit()
+    return [job.id for job in jobs]
+
+
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+def test_list_jobs_query_count_is_constant(db, count_queries, limit):
+    add_jobs(db, max(PAGE_SIZES))
+    client = TestClient(app)
+
+    with count_queries() as counter:
+        response = client.get("/api/v1/jobs/", params={"limit": limit})
+
+    assert response.status_code == 200
+    jobs = response.json()
+    assert len(jobs) == limit
+    assert all(len(job["required_skills"]) == 3 for job in jobs)
+    # One query for the page of jobs and one for all of their skills
+    assert counter.count == 2
+
+
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+def test_load_job_matches_query_count_is_constant(db, count_queries, limit):
+    job_ids = add_jobs(db, max(PAGE_SIZES))
+    top_jobs = [(job_id, 1.0 / (rank + 1)) for rank, job_id in enumerate(reversed(job_ids[:limit]))]
+
+    with count_queries() as counter:
+        matches = _load_job_matches(db, top_jobs)
+
+    assert [match.id for match in matches] == [job_id for job_id, _ in top_jobs]
+    assert all(len(match.required_skills) == 3 for match in matches)
+    assert counter.count == 2
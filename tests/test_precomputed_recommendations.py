@@ -0,0 +1,41 @@
+from app.core.config import settings
+from app.models.job import Job
+from app.models.skill import Skill
+from app.models.user import User
+from app.schemas.job import RecommendationFilters
+from app.services.job_recommendations import rank_jobs
+from app.services.score_store import rebuild_user_scores
+
+
+def add_user_and_jobs(db):
+    python, sql, go = (Skill(name=name, category="test") for name in ("python", "sql", "go"))
+    user = User(email="dev@example.com", hashed_password="x", full_name="Dev", skills=[python, sql])
+    # Full matches rank first; only the lowest ranked job is remote
+    postings = [([python, sql], False)] * 3 + [([python, go], True)]
+    jobs = [
+        Job(
+            title=f"Job {i}",
+            company="Acme",
+            location="Remote" if remote else "Austin, TX",
+            description="Build things",
+            job_type="Full-time",
+            url=f"https://example.com/jobs/{i}",
+            source="test",
+            remote=remote,
+            is_active=True,
+            required_skills=skills
+        )
+        for i, (skills, remote) in enumerate(postings)
+    ]
+    db.add_all([user] + jobs)
+    db.commit()
+    return user, jobs
+
+
+def test_filters_reach_jobs_ranked_below_the_precomputed_cut(db, monkeypatch):
+    monkeypatch.setattr(settings, "RECOMMENDATION_BACKEND", "precomputed")
+    user, jobs = add_user_and_jobs(db)
+    rebuild_user_scores(db, user.id, top_n=2)
+
+    assert rank_jobs(db, user, 10) == [(jobs[0].id, 100.0), (jobs[1].id, 100.0)]
+    assert rank_jobs(db, user, 10, RecommendationFilters(remote=True)) == [(jobs[3].id, 50.0)]
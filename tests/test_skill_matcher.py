@@ -0,0 +1,21 @@
+import pytest
+
+from app.services.skill_matcher import SkillMatcher, build_patterns
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(build_patterns([]))
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("Backend services in Go and R", ["go", "r"]),
+    ("We use c# and C++ daily", ["c#", "c++"]),
+    ("Some Python, some golang", ["python", "go"]),
+    ("Ready to go, with a r budget", []),
+    ("Be the Go-to person for our R&D team", []),
+    ("Experience with AI and ML", ["ai", "machine learning"]),
+    ("Knows Java, not JavaScript or google", ["java", "javascript"]),
+])
+def test_find_skills(matcher, text, skills):
+    assert matcher.find(text) == skills